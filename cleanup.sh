@@ -24,6 +24,7 @@ rm -f snmp_client_test.py
 # 删除旧的配置文件
 echo "删除旧的配置文件..."
 rm -f config.py
+rm -f config_generated.py
 
 # 删除 Python 缓存文件
 echo "删除 Python 缓存文件..."
@@ -11,8 +11,166 @@
 """
 
 import configparser
+import datetime
+import importlib.util
+import mmap
+import operator
 import os
-from typing import Dict, List, Any
+import pprint
+import struct
+import sys
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class ParsedConfig:
+    """
+    单次解析的配置结果
+
+    派生的配置字典和 OID 映射在首次访问时构建并缓存，
+    同一份配置文件被重复加载时直接复用，无需重新解析。
+    """
+    sections: Dict[str, Dict[str, str]]
+    snmp_sections: List[Tuple[str, Dict[str, str]]]     # SNMP_OID_* 节
+    system_sections: List[Tuple[str, Dict[str, str]]]   # SYSTEM_OID_* 节
+    # 构建 OID 映射时跳过的配置节及原因（导入时日志尚未配置，由桥接服务启动后统一记录）
+    skipped: List[str] = field(default_factory=list)
+
+    @cached_property
+    def snmp_bridge_config(self) -> Dict[str, Any]:
+        return _build_section_config(self.sections, 'SNMP_BRIDGE_CONFIG', SNMP_BRIDGE_SCHEMA)
+
+    @cached_property
+    def modbus_tcp_config(self) -> Dict[str, Any]:
+        return _build_section_config(self.sections, 'MODBUS_TCP_CONFIG', MODBUS_TCP_SCHEMA)
+
+    @cached_property
+    def modbus_rtu_config(self) -> Dict[str, Any]:
+        return _build_section_config(self.sections, 'MODBUS_RTU_CONFIG', MODBUS_RTU_SCHEMA)
+
+    @cached_property
+    def modbus_config(self) -> Dict[str, Any]:
+        """当前使用的 Modbus 连接配置：modbus_type 为 TCP 时取 TCP 配置，否则取 RTU 配置"""
+        if self.snmp_bridge_config.get('modbus_type') == 'TCP':
+            return self.modbus_tcp_config
+        return self.modbus_rtu_config
+
+    @cached_property
+    def system_oid_mapping(self) -> List[Dict[str, Any]]:
+        return _build_system_oid_mapping(self.system_sections, self.skipped)
+
+    @cached_property
+    def snmp_oid_mapping(self) -> List['OidRecord']:
+        return _build_snmp_oid_mapping(self.snmp_sections, self.skipped)
+
+    @cached_property
+    def modbus_read_plan(self) -> List[Dict[str, Any]]:
+        return _build_modbus_read_plan(self.snmp_oid_mapping, self.modbus_config['max_read_gap'])
+
+
+@dataclass(frozen=True, slots=True)
+class OidRecord:
+    """
+    业务 OID 配置记录
+
+    加载配置时一次性构建，之后只读；字段以 slot 存储，
+    比字典占用更少内存，属性访问也更快。
+    """
+    oid: str
+    oid_tuple: Tuple[int, ...]
+    description: str
+    snmp_data_type: str
+    processing_type: Optional[str]
+    transform: Optional[Callable[[Any], Any]]          # multiply 处理函数
+    # Modbus 读取配置（通讯状态等无需读取寄存器的 OID 均为 None）
+    register_address: Optional[int] = None
+    unit_id: Optional[int] = None
+    function_code: Optional[int] = None
+    data_type: Optional[str] = None
+    cache_ttl_ms: Optional[int] = None                 # 读取结果缓存时间，None 表示使用 update_interval
+
+
+# 各配置节读取的字段：字段名 -> (类型转换函数, 默认值)
+# 类型转换函数为 None 表示保留字符串原值；默认值为 None 表示缺省时不写入该字段
+SNMP_BRIDGE_SCHEMA = {
+    'listen_ip': (None, None),
+    'listen_port': (int, 1161),
+    'community': (None, None),
+    'modbus_type': (None, None),
+    'timezone_offset': (None, None),
+    'startup_delay': (int, 2),
+    'error_value': (int, -99998),
+}
+
+MODBUS_TCP_SCHEMA = {
+    'server_ip': (None, None),
+    'port': (int, 502),
+    'timeout': (int, 3),
+    'retry_interval': (int, 10),
+    'update_interval': (int, 5),
+    'max_read_gap': (int, 0),
+}
+
+MODBUS_RTU_SCHEMA = {
+    'port': (None, None),
+    'baudrate': (int, 9600),
+    'bytesize': (int, 8),
+    'parity': (None, None),
+    'stopbits': (int, 1),
+    'timeout': (int, 3),
+    'retry_interval': (int, 10),
+    'update_interval': (int, 5),
+    'max_read_gap': (int, 0),
+}
+
+# 各 Modbus 数据类型占用的寄存器数量
+REGISTER_COUNTS = {
+    'int16': 1,
+    'uint16': 1,
+    'int32': 2,
+    'uint32': 2,
+    'float32': 2,
+    'int64': 4,
+    'uint64': 4,
+    'float64': 4,
+}
+
+# 各 Modbus 数据类型对应的 struct 格式字符（大端序），符号和浮点格式由 struct 直接处理
+STRUCT_CODES = {
+    'uint16': 'H',
+    'int16': 'h',
+    'uint32': 'I',
+    'int32': 'i',
+    'float32': 'f',
+    'uint64': 'Q',
+    'int64': 'q',
+    'float64': 'd',
+}
+
+# 各 Modbus 数据类型的单值解码函数（分组成员地址重叠、无法合成一个 struct 格式时使用），
+# 用法：decoder(寄存器字节串, 字节偏移)[0]
+DECODERS = {data_type: struct.Struct('>' + code).unpack_from for data_type, code in STRUCT_CODES.items()}
+
+# 分组读取参数：相邻地址之间未配置的寄存器数不超过 max_read_gap（Modbus 配置项，默认 0，
+# 即只合并连续或重叠的地址）时合并读取；很多设备会拒绝包含未映射地址的读取，
+# 确认设备允许后才应调大。单次读取数量不超过 Modbus 协议上限（寄存器 125 个，线圈/离散输入 2000 个）
+READ_PLAN_MAX_REGISTERS = 125
+READ_PLAN_MAX_BITS = 2000
+
+# 系统 OID 类型和 SNMP 数据类型编码表，处理器按 uint8 下标分支而不比较字符串
+SYSTEM_TYPE_TABLE = ('fixed_value', 'uptime', 'utc_time')
+SYSTEM_SNMP_TYPE_TABLE = ('OctetString', 'Integer', 'TimeTicks')
+UNKNOWN_TAG = 255
+
+
+# 预生成配置模块的文件名（与 config.ini 位于同一目录），
+# 由 ConfigLoader.freeze() 生成，导入时直接使用其中的字面量，无需解析 INI
+GENERATED_MODULE = 'config_generated.py'
+
+# 解析结果缓存：(绝对路径, mtime_ns, 文件大小) -> ParsedConfig
+_PARSE_CACHE: Dict[Tuple[str, int, int], ParsedConfig] = {}
+
 
 class ConfigLoader:
     """配置文件加载器"""
@@ -25,145 +183,465 @@ class ConfigLoader:
             config_file: 配置文件路径
         """
         self.config_file = config_file
-        self.config = configparser.ConfigParser()
         self.load_config()
     
     def load_config(self):
-        """加载配置文件"""
+        """
+        加载配置文件
+
+        解析结果按 (路径, mtime, 大小) 缓存，文件未修改时直接复用
+        已解析的配置，修改后自动重新解析。
+        """
         if not os.path.exists(self.config_file):
             raise FileNotFoundError(f"配置文件不存在: {self.config_file}")
         
-        self.config.read(self.config_file, encoding='utf-8')
+        path = os.path.abspath(self.config_file)
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        
+        parsed = _PARSE_CACHE.get(key)
+        if parsed is None:
+            generated_path = os.path.join(os.path.dirname(path), GENERATED_MODULE)
+            sections = _load_generated(generated_path, key)
+            if sections is None:
+                data = _read_text(path)
+                sections = _parse_ini_fast(data)
+                if sections is None:
+                    sections = _parse_ini_configparser(data, path)
+                
+                # 已存在的预生成模块过期时重新生成
+                if os.path.exists(generated_path):
+                    try:
+                        _write_generated(generated_path, key, sections)
+                    except OSError:
+                        pass  # 目录不可写时忽略，不影响配置加载
+            parsed = ParsedConfig(sections, *_bucket_sections(sections))
+            
+            # 丢弃同一文件的旧版本缓存
+            for stale_key in [k for k in _PARSE_CACHE if k[0] == path]:
+                del _PARSE_CACHE[stale_key]
+            _PARSE_CACHE[key] = parsed
+        
+        self.parsed = parsed
+        self.sections = parsed.sections
+    
+    def freeze(self) -> str:
+        """
+        将解析后的配置写成 Python 模块（config.ini 同目录下的 config_generated.py）
+
+        生成的模块只包含字面量，之后加载配置时直接导入（由 .pyc 缓存字节码），
+        不再解析 config.ini；config.ini 修改后会自动重新生成。
+
+        Returns:
+            生成的文件路径
+        """
+        source = os.path.abspath(self.config_file)
+        path = os.path.join(os.path.dirname(source), GENERATED_MODULE)
+        st = os.stat(source)
+        _write_generated(path, (source, st.st_mtime_ns, st.st_size), self.sections)
+        return path
     
     def get_snmp_bridge_config(self) -> Dict[str, Any]:
         """获取 SNMP 桥接配置"""
-        section = 'SNMP_BRIDGE_CONFIG'
-        if section not in self.config:
-            raise ValueError(f"配置文件中缺少 [{section}] 部分")
-        
-        config = dict(self.config[section])
-        
-        # 类型转换
-        config['listen_port'] = int(config.get('listen_port', 1161))
-        config['startup_delay'] = int(config.get('startup_delay', 2))
-        config['error_value'] = int(config.get('error_value', -99998))
-        
-        return config
+        return self.parsed.snmp_bridge_config
     
     def get_modbus_tcp_config(self) -> Dict[str, Any]:
         """获取 Modbus TCP 配置"""
-        section = 'MODBUS_TCP_CONFIG'
-        if section not in self.config:
-            raise ValueError(f"配置文件中缺少 [{section}] 部分")
-        
-        config = dict(self.config[section])
-        
-        # 类型转换
-        config['port'] = int(config.get('port', 502))
-        config['timeout'] = int(config.get('timeout', 3))
-        config['retry_interval'] = int(config.get('retry_interval', 10))
-        config['update_interval'] = int(config.get('update_interval', 5))
-        
-        return config
+        return self.parsed.modbus_tcp_config
     
     def get_modbus_rtu_config(self) -> Dict[str, Any]:
         """获取 Modbus RTU 配置"""
-        section = 'MODBUS_RTU_CONFIG'
-        if section not in self.config:
-            raise ValueError(f"配置文件中缺少 [{section}] 部分")
-        
-        config = dict(self.config[section])
-        
-        # 类型转换
-        config['baudrate'] = int(config.get('baudrate', 9600))
-        config['bytesize'] = int(config.get('bytesize', 8))
-        config['stopbits'] = int(config.get('stopbits', 1))
-        config['timeout'] = int(config.get('timeout', 3))
-        config['retry_interval'] = int(config.get('retry_interval', 10))
-        config['update_interval'] = int(config.get('update_interval', 5))
-        
-        return config
+        return self.parsed.modbus_rtu_config
+    
+    def get_modbus_config(self) -> Dict[str, Any]:
+        """获取当前使用的 Modbus 连接配置（按 modbus_type 选择 TCP 或 RTU）"""
+        return self.parsed.modbus_config
     
     def get_system_oid_mapping(self) -> List[Dict[str, Any]]:
         """获取系统 OID 映射配置"""
-        system_oids = []
+        return self.parsed.system_oid_mapping
+    
+    def get_snmp_oid_mapping(self) -> List['OidRecord']:
+        """获取 SNMP OID 映射配置"""
+        return self.parsed.snmp_oid_mapping
+    
+    def get_skipped_oid_sections(self) -> List[str]:
+        """获取构建 OID 映射时跳过的配置节及原因（OID 映射构建后才会填充）"""
+        return self.parsed.skipped
+    
+    def get_modbus_read_plan(self) -> List[Dict[str, Any]]:
+        """获取 Modbus 分组读取计划"""
+        return self.parsed.modbus_read_plan
+
+
+# ============================================================================
+# INI 解析
+# ============================================================================
+
+def _read_text(path: str) -> str:
+    """通过 mmap 读取配置文件（直接映射页缓存，不经过缓冲文本 I/O 层）"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return ''  # 空文件无法映射
+        with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm:
+            return mm[:].decode('utf-8')
+    finally:
+        os.close(fd)
+
+
+def _parse_ini_fast(data: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    快速解析本项目使用的固定格式 INI 文件
+
+    只处理 [节]、key = value 和整行注释，结果与 ConfigParser 默认行为一致
+    （键名转小写、值去除首尾空白）。遇到插值（%）、多行值、DEFAULT 节、
+    重复项等需要 ConfigParser 处理的情况时返回 None。
+    """
+    if '%' in data:
+        return None
+    
+    sections: Dict[str, Dict[str, str]] = {}
+    cur = None
+    for line in data.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped[0] in '#;':
+            continue
+        if line[0] in ' \t':
+            # 缩进行是上一项的续行
+            return None
+        if stripped[0] == '[' and stripped[-1] == ']':
+            name = stripped[1:-1]
+            if name in sections or name == 'DEFAULT':
+                return None
+            cur = sections[name] = {}
+            continue
         
-        # 查找所有 SYSTEM_OID_* 部分
-        for section_name in self.config.sections():
-            if section_name.startswith('SYSTEM_OID_'):
-                section = self.config[section_name]
-                oid_config = {
-                    'oid': section.get('oid'),
-                    'description': section.get('description'),
-                    'type': section.get('type'),
-                    'snmp_data_type': section.get('snmp_data_type', 'OctetString')
-                }
-                
-                # 如果是固定值类型，添加 value 字段
-                if oid_config['type'] == 'fixed_value':
-                    value = section.get('value')
-                    # 尝试转换为整数，如果失败则保持字符串
-                    try:
-                        if oid_config['snmp_data_type'] == 'Integer':
-                            oid_config['value'] = int(value)
-                        else:
-                            oid_config['value'] = value
-                    except (ValueError, TypeError):
-                        oid_config['value'] = value
-                
-                system_oids.append(oid_config)
+        # 分隔符取第一个 '=' 或 ':'
+        eq = stripped.find('=')
+        colon = stripped.find(':')
+        pos = eq if colon < 0 or 0 <= eq < colon else colon
+        if cur is None or pos <= 0:
+            return None
+        k = stripped[:pos].rstrip().lower()
+        if k in cur:
+            return None
+        cur[k] = stripped[pos + 1:].lstrip()
+    
+    return sections
+
+
+def _parse_ini_configparser(data: str, source: str) -> Dict[str, Dict[str, str]]:
+    """使用 ConfigParser 解析（支持插值等完整语法，语法错误时抛出原有异常）"""
+    parser = configparser.ConfigParser()
+    parser.read_string(data, source=source)
+    return {name: dict(parser.items(name)) for name in parser.sections()}
+
+
+def _write_generated(path: str, key: Tuple[str, int, int], sections: Dict[str, Dict[str, str]]):
+    """写入预生成配置模块（先写临时文件再替换，避免读到半写入的文件）"""
+    source, mtime_ns, size = key
+    content = (
+        "# 由 config_loader.py 根据 config.ini 自动生成，请勿手动修改\n"
+        f"SOURCE_FILE = {source!r}\n"
+        f"SOURCE_MTIME_NS = {mtime_ns!r}\n"
+        f"SOURCE_SIZE = {size!r}\n"
+        f"SECTIONS = {pprint.pformat(sections, width=120, sort_dicts=False)}\n"
+    )
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _load_generated(path: str, key: Tuple[str, int, int]) -> Optional[Dict[str, Dict[str, str]]]:
+    """导入预生成配置模块，与 config.ini 的路径、mtime、大小一致时返回其中的节字典"""
+    if not os.path.exists(path):
+        return None
+    
+    spec = importlib.util.spec_from_file_location('config_generated', path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        return None  # 文件损坏时回退到解析 config.ini
+    
+    if (getattr(module, 'SOURCE_FILE', None), getattr(module, 'SOURCE_MTIME_NS', None),
+            getattr(module, 'SOURCE_SIZE', None)) != key:
+        return None
+    return module.SECTIONS
+
+
+# ============================================================================
+# 配置构建函数（每份解析结果只执行一次）
+# ============================================================================
+
+def _parse_timezone_offset(timezone_offset: str) -> datetime.timezone:
+    """将 ±HH 格式的时区偏移转换为 tzinfo 对象（无符号时视为 UTC）"""
+    if timezone_offset.startswith('+') or timezone_offset.startswith('-'):
+        sign = 1 if timezone_offset[0] == '+' else -1
+        hours = int(timezone_offset[1:3])
+        offset_minutes = sign * hours * 60
+    else:
+        offset_minutes = 0
+    return datetime.timezone(datetime.timedelta(minutes=offset_minutes))
+
+
+def _bucket_sections(sections: Dict[str, Dict[str, str]]) -> Tuple[List[Tuple[str, Dict[str, str]]], List[Tuple[str, Dict[str, str]]]]:
+    """按名称前缀一次性将 OID 节分到 SNMP_OID_* 和 SYSTEM_OID_* 两组"""
+    snmp_sections = []
+    system_sections = []
+    for name, sec in sections.items():
+        if name.startswith('SNMP_OID_'):
+            snmp_sections.append((name, sec))
+        elif name.startswith('SYSTEM_OID_'):
+            system_sections.append((name, sec))
+    return snmp_sections, system_sections
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """驻留类型名等重复出现的短字符串，所有 OID 共享同一个字符串对象"""
+    return sys.intern(value) if value is not None else None
+
+
+def _tag(table: Tuple[str, ...], value: Optional[str]) -> int:
+    """返回取值在编码表中的下标，不在表中时返回 UNKNOWN_TAG"""
+    return table.index(value) if value in table else UNKNOWN_TAG
+
+
+def _parse_oid(section_name: str, oid: str) -> Tuple[int, ...]:
+    """将 OID 字符串转换为整数元组，用于按数值顺序排序和查找"""
+    try:
+        return tuple(int(x) for x in oid.strip('.').split('.'))
+    except (ValueError, AttributeError):
+        raise ValueError(f"[{section_name}] OID 格式错误: {oid}") from None
+
+
+def _build_section_config(sections: Dict[str, Dict[str, str]], section: str,
+                          schema: Dict[str, Tuple[Optional[Callable[[Any], Any]], Any]]) -> Dict[str, Any]:
+    """按字段表构建配置节字典，只读取表中声明的字段，不复制整个配置节"""
+    if section not in sections:
+        raise ValueError(f"配置文件中缺少 [{section}] 部分")
+    
+    g = sections[section].get
+    config = {}
+    for key, (cast, default) in schema.items():
+        value = g(key, default)
+        if value is None:
+            continue
+        config[key] = value if cast is None else cast(value)
+    
+    return config
+
+
+def _build_system_oid_mapping(system_sections: List[Tuple[str, Dict[str, str]]],
+                              skipped: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """构建系统 OID 映射配置（OID 格式错误的节跳过，原因追加到 skipped）"""
+    system_oids = []
+    
+    for section_name, section in system_sections:
+        # OID 格式错误的节跳过并记录，不影响其他 OID
+        try:
+            oid_tuple = _parse_oid(section_name, section.get('oid'))
+        except ValueError as e:
+            if skipped is not None:
+                skipped.append(str(e))
+            continue
         
-        # 按 OID 排序
-        system_oids.sort(key=lambda x: x['oid'])
-        return system_oids
+        oid_config = {
+            'oid': section.get('oid'),
+            'oid_tuple': oid_tuple,
+            'description': section.get('description'),
+            'type': _intern(section.get('type')),
+            'snmp_data_type': _intern(section.get('snmp_data_type', 'OctetString'))
+        }
+        oid_config['type_tag'] = _tag(SYSTEM_TYPE_TABLE, oid_config['type'])
+        oid_config['snmp_type_tag'] = _tag(SYSTEM_SNMP_TYPE_TABLE, oid_config['snmp_data_type'])
+        
+        # 如果是固定值类型，添加 value 字段
+        if oid_config['type'] == 'fixed_value':
+            value = section.get('value')
+            # 尝试转换为整数，如果失败则保持字符串
+            try:
+                if oid_config['snmp_data_type'] == 'Integer':
+                    oid_config['value'] = int(value)
+                else:
+                    oid_config['value'] = value
+            except (ValueError, TypeError):
+                oid_config['value'] = value
+        
+        system_oids.append(oid_config)
     
-    def get_snmp_oid_mapping(self) -> List[Dict[str, Any]]:
-        """获取 SNMP OID 映射配置"""
-        snmp_oids = []
+    # 按 OID 数值顺序排序（字符串排序会把 .10 排在 .2 之前）
+    system_oids.sort(key=operator.itemgetter('oid_tuple'))
+    return system_oids
+
+
+def _build_multiply_transform(coefficient: float, offset: float, decimal_places: int) -> Callable[[Any], Any]:
+    """构建乘法处理函数（原值 × 系数 + 偏移量，按小数位数取整），参数作为常量绑定"""
+    if decimal_places > 0:
+        return lambda v, c=coefficient, o=offset, d=decimal_places: round(v * c + o, d)
+    return lambda v, c=coefficient, o=offset: v * c + o
+
+
+def _build_snmp_oid_mapping(snmp_sections: List[Tuple[str, Dict[str, str]]],
+                            skipped: Optional[List[str]] = None) -> List['OidRecord']:
+    """
+    构建 SNMP OID 映射配置
+
+    单次遍历 SNMP_OID_* 节，每个键只读取一次，每节直接组装为 OidRecord，最后按 OID 排序。
+    OID 格式错误的节跳过，原因追加到 skipped。
+    """
+    records = []
+    
+    for name, sec in snmp_sections:
+        g = sec.get
         
-        # 查找所有 SNMP_OID_* 部分
-        for section_name in self.config.sections():
-            if section_name.startswith('SNMP_OID_'):
-                section = self.config[section_name]
-                
-                oid_config = {
-                    'oid': section.get('oid'),
-                    'description': section.get('description'),
-                    'snmp_data_type': section.get('snmp_data_type', 'OctetString')
-                }
-                
-                # Modbus 配置
-                processing_type = section.get('processing_type')
-                if processing_type != 'communication_status':
-                    # 需要 Modbus 读取的 OID
-                    register_address = section.get('register_address')
-                    if register_address:  # 只有当存在寄存器地址时才添加 modbus_config
-                        modbus_config = {
-                            'register_address': int(register_address, 16),
-                            'unit_id': int(section.get('unit_id', 1)),
-                            'function_code': int(section.get('function_code', 3)),
-                            'data_type': section.get('data_type', 'uint16')
-                        }
-                        oid_config['modbus_config'] = modbus_config
-                
-                # 数据处理配置
-                data_processing = {
-                    'type': processing_type
-                }
-                
-                if processing_type == 'multiply':
-                    data_processing.update({
-                        'coefficient': float(section.get('coefficient', 1.0)),
-                        'offset': float(section.get('offset', 0.0)),
-                        'decimal_places': int(section.get('decimal_places', 0))
-                    })
-                
-                oid_config['data_processing'] = data_processing
-                snmp_oids.append(oid_config)
+        # OID 格式错误的节跳过并记录，不影响其他 OID
+        oid = g('oid')
+        try:
+            oid_tuple = _parse_oid(name, oid)
+        except ValueError as e:
+            if skipped is not None:
+                skipped.append(str(e))
+            continue
+        
+        # Modbus 配置：只有存在寄存器地址且不是通讯状态时才需要读取
+        processing_type = _intern(g('processing_type'))
+        register_address = g('register_address') if processing_type != 'communication_status' else None
+        if register_address:
+            cache_ttl_ms = g('cache_ttl_ms')
+            modbus = {
+                'register_address': int(register_address, 16),
+                'unit_id': int(g('unit_id', 1)),
+                'function_code': int(g('function_code', 3)),
+                'data_type': _intern(g('data_type', 'uint16')),
+                'cache_ttl_ms': int(cache_ttl_ms) if cache_ttl_ms is not None else None
+            }
+        else:
+            modbus = {}
         
-        # 按 OID 排序
-        snmp_oids.sort(key=lambda x: x['oid'])
-        return snmp_oids
+        # 数据处理配置
+        if processing_type == 'multiply':
+            transform = _build_multiply_transform(float(g('coefficient', 1.0)),
+                                                  float(g('offset', 0.0)),
+                                                  int(g('decimal_places', 0)))
+        else:
+            transform = None
+        
+        records.append(OidRecord(
+            oid=oid,
+            oid_tuple=oid_tuple,
+            description=g('description'),
+            snmp_data_type=_intern(g('snmp_data_type', 'OctetString')),
+            processing_type=processing_type,
+            transform=transform,
+            **modbus
+        ))
+    
+    # 按 OID 数值顺序排序
+    records.sort(key=operator.attrgetter('oid_tuple'))
+    return records
+
+
+def _build_modbus_read_plan(records: List['OidRecord'], max_gap: int = 0) -> List[Dict[str, Any]]:
+    """
+    构建 Modbus 分组读取计划
+
+    按 (单元 ID, 功能码) 分组，将地址间隔不超过 max_gap 的 OID 合并为一次连续读取。
+    每个分组记录起始地址、读取数量、成员 (OID 元组, 分组内偏移, 数据类型)
+    以及解码函数 decode，桥接服务每个分组只发起一次 Modbus 请求，
+    再用 decode 一次解出全部成员的值（与 members 顺序一致）。
+    """
+    by_device: Dict[Tuple[int, int], List[Tuple[int, int, Tuple[int, ...], str]]] = {}
+    for rec in records:
+        if rec.register_address is None:
+            continue
+        # 线圈/离散输入按位读取，每个 OID 占 1 位
+        width = 1 if rec.function_code in (1, 2) else REGISTER_COUNTS.get(rec.data_type, 1)
+        by_device.setdefault((rec.unit_id, rec.function_code), []).append(
+            (rec.register_address, width, rec.oid_tuple, rec.data_type)
+        )
+    
+    plan = []
+    for (unit_id, function_code), items in sorted(by_device.items()):
+        max_count = READ_PLAN_MAX_BITS if function_code in (1, 2) else READ_PLAN_MAX_REGISTERS
+        items.sort(key=operator.itemgetter(0))
+        group = None
+        for address, width, oid_tuple, data_type in items:
+            if group is not None:
+                group_end = group['start'] + group['count']
+                merged_count = max(address + width, group_end) - group['start']
+            if (group is not None
+                    and address - group_end <= max_gap
+                    and merged_count <= max_count):
+                group['count'] = merged_count
+            else:
+                group = {
+                    'unit_id': unit_id,
+                    'function_code': function_code,
+                    'start': address,
+                    'count': width,
+                    'members': []
+                }
+                plan.append(group)
+            group['members'].append((oid_tuple, address - group['start'], data_type))
+    
+    for group in plan:
+        group['decode'] = _build_group_decoder(group['function_code'], group['members'])
+    
+    return plan
+
+
+def split_read_group(group: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    将读取分组拆成每个成员单独读取的分组
+
+    设备拒绝整组读取时（如读取范围包含未配置的地址）使用，拆分后的分组与 members 顺序一致。
+    """
+    function_code = group['function_code']
+    parts = []
+    for oid_tuple, offset, data_type in group['members']:
+        member = (oid_tuple, 0, data_type)
+        parts.append({
+            'unit_id': group['unit_id'],
+            'function_code': function_code,
+            'start': group['start'] + offset,
+            'count': 1 if function_code in (1, 2) else REGISTER_COUNTS.get(data_type, 1),
+            'members': [member],
+            'decode': _build_group_decoder(function_code, [member])
+        })
+    return parts
+
+
+def _build_group_decoder(function_code: int,
+                         members: List[Tuple[Tuple[int, ...], int, str]]) -> Callable[[Any], Any]:
+    """
+    构建分组解码函数，返回值按 members 顺序排列
+
+    寄存器分组拼成一个 struct 格式（成员之间的空隙用填充字节跳过），一次 unpack_from
+    解出所有成员；成员地址重叠时无法用单个格式表示，改为逐个成员解码。
+    线圈/离散输入直接按偏移取位值。
+    """
+    if function_code in (1, 2):
+        offsets = [offset for _, offset, _ in members]
+        return lambda bits: [bits[offset] for offset in offsets]
+    
+    fmt = ['>']
+    position = 0  # 已覆盖到的寄存器偏移
+    for _, offset, data_type in members:
+        if offset < position:
+            decoders = [(DECODERS.get(data_type, DECODERS['uint16']), offset * 2)
+                        for _, offset, data_type in members]
+            return lambda data: [decode(data, byte_offset)[0] for decode, byte_offset in decoders]
+        if offset > position:
+            fmt.append(f'{(offset - position) * 2}x')
+        fmt.append(STRUCT_CODES.get(data_type, 'H'))  # 未知类型按 uint16 解码
+        position = offset + REGISTER_COUNTS.get(data_type, 1)
+    
+    return struct.Struct(''.join(fmt)).unpack_from
+
 
 # 全局配置加载器实例
 _config_loader = ConfigLoader()
@@ -173,13 +651,24 @@ SNMP_BRIDGE_CONFIG = _config_loader.get_snmp_bridge_config()
 MODBUS_TYPE = SNMP_BRIDGE_CONFIG['modbus_type']
 MODBUS_TCP_CONFIG = _config_loader.get_modbus_tcp_config()
 MODBUS_RTU_CONFIG = _config_loader.get_modbus_rtu_config()
-SYSTEM_OID_MAPPING = _config_loader.get_system_oid_mapping()
-SNMP_OID_MAPPING = _config_loader.get_snmp_oid_mapping()
+# 当前使用的 Modbus 连接配置（MODBUS_TCP_CONFIG 或 MODBUS_RTU_CONFIG 之一）
+MODBUS_CONFIG = _config_loader.get_modbus_config()
+# 构建 OID 映射时跳过的配置节（与解析结果共用同一个列表，OID 映射构建后填充）
+SKIPPED_OID_SECTIONS = _config_loader.get_skipped_oid_sections()
+
+# OID 映射按需构建（见模块级 __getattr__），只需要连接配置的工具
+# 导入本模块时不会遍历全部 OID 节
+_LAZY_EXPORTS = {
+    'SYSTEM_OID_MAPPING': _config_loader.get_system_oid_mapping,
+    'SNMP_OID_MAPPING': _config_loader.get_snmp_oid_mapping,
+    'MODBUS_READ_PLAN': _config_loader.get_modbus_read_plan,
+}
 
-# 时区配置（从 SNMP_BRIDGE_CONFIG 中提取）
+# 时区配置（从 SNMP_BRIDGE_CONFIG 中提取，tzinfo 在加载时构建一次供时间 OID 复用）
 TIMEZONE_CONFIG = {
     'timezone_offset': SNMP_BRIDGE_CONFIG['timezone_offset'],
-    'timezone_name': 'Custom Timezone'
+    'timezone_name': 'Custom Timezone',
+    'tzinfo': _parse_timezone_offset(SNMP_BRIDGE_CONFIG['timezone_offset'])
 }
 
 # 其他配置
@@ -195,8 +684,23 @@ SNMP_CONFIG = {
     'community': SNMP_BRIDGE_CONFIG['community']
 }
 
+
+def __getattr__(name):
+    """首次访问 OID 映射时构建，并缓存为模块全局变量（PEP 562）"""
+    getter = _LAZY_EXPORTS.get(name)
+    if getter is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getter()
+    globals()[name] = value
+    return value
+
+
 if __name__ == "__main__":
-    """测试配置加载"""
+    """测试配置加载（--freeze：生成 config_generated.py）"""
+    if '--freeze' in sys.argv[1:]:
+        print(f"✅ 已生成预编译配置: {_config_loader.freeze()}")
+        sys.exit(0)
+    
     print("🧪 测试配置加载")
     print("=" * 50)
     
@@ -206,8 +710,8 @@ if __name__ == "__main__":
     
     print(f"\nModbus 类型: {MODBUS_TYPE}")
     
-    print(f"\n系统 OID 数量: {len(SYSTEM_OID_MAPPING)}")
-    print(f"业务 OID 数量: {len(SNMP_OID_MAPPING)}")
+    print(f"\n系统 OID 数量: {len(_config_loader.get_system_oid_mapping())}")
+    print(f"业务 OID 数量: {len(_config_loader.get_snmp_oid_mapping())}")
     
     print(f"\n时区配置: {TIMEZONE_CONFIG}")
     
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+pytest 共享夹具
+
+config_loader 和 snmp_modbus_bridge 在导入时加载当前目录的 config.ini，
+这里在临时目录中放一份 config.linux.ini 的副本，整个测试会话只导入一次，
+所有测试文件使用同一份配置。
+"""
+
+import importlib
+import os
+import shutil
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LINUX_CONFIG = os.path.join(HERE, 'config.linux.ini')
+
+
+@pytest.fixture(scope='session')
+def config_dir(tmp_path_factory):
+    """放有 config.ini（config.linux.ini 副本）的临时目录"""
+    workdir = tmp_path_factory.mktemp('config')
+    shutil.copy(LINUX_CONFIG, workdir / 'config.ini')
+    return workdir
+
+
+def _import_in(workdir, name):
+    """在 workdir 下导入模块，使其加载该目录的 config.ini"""
+    if name in sys.modules:
+        return sys.modules[name]
+    old_cwd = os.getcwd()
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    os.chdir(workdir)
+    try:
+        return importlib.import_module(name)
+    finally:
+        os.chdir(old_cwd)
+
+
+@pytest.fixture(scope='session')
+def config_loader(config_dir):
+    """按测试配置导入的 config_loader 模块"""
+    return _import_in(config_dir, 'config_loader')
+
+
+@pytest.fixture(scope='session')
+def bridge(config_loader, config_dir):
+    """按测试配置导入的 snmp_modbus_bridge 模块（缺少 pysnmp / pymodbus 时跳过）"""
+    pytest.importorskip('pysnmp')
+    pytest.importorskip('pymodbus')
+    return _import_in(config_dir, 'snmp_modbus_bridge')
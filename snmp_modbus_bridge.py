@@ -9,13 +9,13 @@ SNMP-Modbus 桥接服务
 1. SNMP 服务器：监听 SNMP 请求并响应
 2. Modbus 客户端：连接 Modbus 设备读取数据
 3. 数据转换：支持多种数据类型转换和处理
-4. 实时响应：每次 SNMP 请求都实时读取 Modbus 数据
+4. 实时响应：SNMP 请求时读取 Modbus 数据（update_interval 秒内复用上次读取结果）
 5. 错误处理：完善的错误处理和日志记录
 
 支持的功能：
 - Modbus TCP/RTU 连接
 - 多种 SNMP 数据类型（Integer, OctetString, Gauge, Counter, TimeTicks）
-- 多种 Modbus 数据类型（int16, uint16, int32, uint32, float32）
+- 多种 Modbus 数据类型（int16, uint16, int32, uint32, float32, int64, uint64, float64）
 - 系统 OID（设备信息、时间等）
 - 业务 OID（传感器数据、设备状态等）
 - 时区配置支持
@@ -27,10 +27,16 @@ SNMP-Modbus 桥接服务
 """
 
 # 标准库导入
+import asyncio
 import time
 import datetime
 import logging
 import bisect
+import itertools
+import socket
+import struct
+from collections import OrderedDict, deque
+from types import SimpleNamespace
 
 # SNMP 相关库
 from pysnmp.carrier.asyncio.dispatch import AsyncioDispatcher
@@ -39,13 +45,15 @@ from pyasn1.codec.ber import encoder, decoder
 from pysnmp.proto import api
 
 # Modbus 相关库
-from pymodbus.client import ModbusTcpClient, ModbusSerialClient
-from pymodbus.exceptions import ModbusException
+from pymodbus.client import AsyncModbusTcpClient, AsyncModbusSerialClient
+from pymodbus.exceptions import ModbusException, ConnectionException
 
 # 本地配置文件
 from config_loader import (
-    SNMP_OID_MAPPING, MODBUS_TYPE, MODBUS_TCP_CONFIG, MODBUS_RTU_CONFIG,
-    SYSTEM_OID_MAPPING, TIMEZONE_CONFIG, SNMP_BRIDGE_CONFIG
+    SNMP_OID_MAPPING, MODBUS_TYPE, MODBUS_TCP_CONFIG, MODBUS_RTU_CONFIG, MODBUS_CONFIG,
+    SYSTEM_OID_MAPPING, TIMEZONE_CONFIG, SNMP_BRIDGE_CONFIG,
+    MODBUS_READ_PLAN, SYSTEM_TYPE_TABLE, SYSTEM_SNMP_TYPE_TABLE, SKIPPED_OID_SECTIONS,
+    split_read_group
 )
 
 # ============================================================================
@@ -57,365 +65,565 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# ============================================================================
-# 核心类定义
-# ============================================================================
+# 业务 OID 响应不逐条记录 INFO 日志，每 _RESPONSE_LOG_EVERY 次响应抽样记录一次
+_RESPONSE_LOG_EVERY = 1000
+_response_counter = itertools.count(1)  # next() 在 GIL 下是原子操作
 
-class ModbusOIDHandler:
-    """
-    Modbus OID 处理器
+# 最近的业务 OID 失败事件 (time.time(), OID, 错误信息)，供 ModbusOIDHandler.stats() 诊断；
+# 只在失败时写入，正常响应不产生任何记录
+_LAST_EVENTS = deque(maxlen=1024)
 
-    负责处理 SNMP OID 到 Modbus 寄存器的映射和数据转换。
-    每个实例对应一个 OID，包含该 OID 的所有配置信息和处理逻辑。
+# 各 SNMP 版本的 ASN.1 模板：解码用的 Message 规格和用于判断请求类型的 PDU 实例，
+# 只作为类型模板使用，所有请求共用，不必每个数据报重新构造
+_ASN1_SPECS = {ver: mod.Message() for ver, mod in api.PROTOCOL_MODULES.items()}
+_GETNEXT_PDUS = {ver: mod.GetNextRequestPDU() for ver, mod in api.PROTOCOL_MODULES.items()}
+_GET_PDUS = {ver: mod.GetRequestPDU() for ver, mod in api.PROTOCOL_MODULES.items()}
 
-    主要功能：
-    1. 存储 OID 配置信息（寄存器地址、数据类型、处理方式等）
-    2. 实时读取 Modbus 数据
-    3. 数据类型转换（int16/uint16/int32/uint32/float32）
-    4. 数据处理（乘法、直接映射、通讯状态等）
-    5. SNMP 数据类型转换
-    6. 错误处理和日志记录
-    """
+# 响应编码缓存：(SNMP 版本, 错误索引, 变量绑定) -> 响应报文中 request-id 之后的编码字节，
+# 轮询取值不变时只需重新拼接版本、团体名和 request-id，跳过整条消息的 BER 编码
+_RESPONSE_CACHE_SIZE = 256
+_response_cache = OrderedDict()
+_RESPONSE_PDU_TAG = 0xA2  # GetResponse-PDU（v1 与 v2c 相同）
 
-    def __init__(self, oid_config):
-        """
-        初始化 OID 处理器
-        
-        Args:
-            oid_config: 来自 config.py 的 OID 配置
-        """
-        self.oid_str = oid_config['oid']
-        self.name = tuple(int(x) for x in oid_config['oid'].strip('.').split('.'))
-        self.description = oid_config['description']
-        self.modbus_config = oid_config.get('modbus_config')  # 可能为 None（通讯状态 OID）
-        self.data_processing = oid_config['data_processing']
-        self.snmp_config = {'data_type': oid_config.get('snmp_data_type', 'Integer32')}
-        
-        # Modbus 客户端（延迟初始化）
-        self.modbus_client = None
-        self.last_value = None
-        self.last_error = None
-        
-        logger.info(f"📋 注册 OID: {self.oid_str} -> {self.description}")
-        if self.modbus_config is not None:
-            logger.info(f"   Modbus: 单元{self.modbus_config['unit_id']}, "
-                       f"寄存器0x{self.modbus_config['register_address']:X}, "
-                       f"功能码{self.modbus_config['function_code']}")
-        else:
-            logger.info(f"   Modbus: 无需读取寄存器（通讯状态 OID）")
-        logger.info(f"   数据处理: {self.data_processing['type']}")
-        logger.info(f"   SNMP类型: {self.snmp_config.get('data_type', 'Integer32')}")
+# ============================================================================
+# Modbus 分组读取
+# ============================================================================
 
-    def __eq__(self, other):
-        return self.name == other
+# OID 元组 -> (读取计划中的分组索引, 在分组解码结果中的下标)
+_READ_SLOTS = {
+    oid_tuple: (group_index, member_index)
+    for group_index, group in enumerate(MODBUS_READ_PLAN)
+    for member_index, (oid_tuple, _, _) in enumerate(group['members'])
+}
+
+# 系统 OID 类型 / SNMP 数据类型的 uint8 编码
+_TAG_FIXED_VALUE = SYSTEM_TYPE_TABLE.index('fixed_value')
+_TAG_UPTIME = SYSTEM_TYPE_TABLE.index('uptime')
+_TAG_UTC_TIME = SYSTEM_TYPE_TABLE.index('utc_time')
+_TAG_SNMP_INTEGER = SYSTEM_SNMP_TYPE_TABLE.index('Integer')
+
+# 当前使用的 Modbus 连接配置
+_MODBUS_CONFIG = MODBUS_CONFIG
+
+# 分组读取结果的默认缓存时间（纳秒），0 表示每个 SNMP PDU 都重新读取；
+# 单个 OID 可用 cache_ttl_ms 覆盖（如计数器等易变数据设为 0）
+_READ_TTL_NS = _MODBUS_CONFIG['update_interval'] * 1_000_000_000
+
+# 已读取的分组：分组索引 -> (读取时间 time.monotonic_ns(), 分组内各 OID 的解码值，读取失败为 None)
+# 每个 PDU 处理前先并发刷新过期分组，之后各 OID 处理器直接从这里取值
+_group_cache = {}
+# 正在读取的分组：分组索引 -> asyncio.Task，并发的 PDU 需要同一分组时共用一次读取
+_inflight_reads = {}
+# 设备拒绝整组读取的分组：分组索引 -> (重试整组读取的时间 time.monotonic_ns(), 拆分后逐个成员读取的分组列表)
+_split_groups = {}
+# _read_group 的返回值：设备因地址范围无效拒绝了读取请求
+_REJECTED = object()
+# 需要拆分分组的 Modbus 异常码：02 非法数据地址、03 非法数据值（数量超出设备支持）；
+# 其他异常码（04 设备故障、06 设备忙、0A/0B 网关错误等）按临时读取失败处理
+_SPLIT_EXCEPTION_CODES = (2, 3)
+
+# 所有 OID 共用的 Modbus 客户端（延迟创建，连接在请求之间保持）
+_modbus_client = None
+# 功能码 -> 共享客户端的读取方法（创建客户端时绑定，重连后客户端对象不变）
+_read_fns = {}
+# 保证同一时间只有一个协程在建立连接
+_connect_lock = asyncio.Lock()
+# 连接失败后，在此时间（time.monotonic()）之前不再尝试重连
+_next_connect_time = 0.0
+# 连续连接失败次数，重连间隔按 1, 2, 4... 秒递增，最长为 retry_interval
+_connect_failures = 0
+
+# Modbus TCP 连接的 keepalive 参数（秒）：空闲多久开始探测、探测间隔
+_TCP_KEEPIDLE = 30
+_TCP_KEEPINTVL = 10
+
+
+def _get_modbus_client():
+    """获取或创建共享的 Modbus 异步客户端"""
+    global _modbus_client
+    if _modbus_client is None:
+        try:
+            # 从全局配置中获取 Modbus 连接信息
+            # 重连由 _connect_modbus_client 控制，关闭 pymodbus 的自动重连
+            if MODBUS_TYPE == 'TCP':
+                modbus_host = MODBUS_TCP_CONFIG['server_ip']
+                modbus_port = MODBUS_TCP_CONFIG['port']
+                timeout = MODBUS_TCP_CONFIG['timeout']
+
+                _modbus_client = AsyncModbusTcpClient(
+                    host=modbus_host,
+                    port=modbus_port,
+                    timeout=timeout,
+                    reconnect_delay=0
+                )
+                logger.debug(f"🔗 创建 Modbus TCP 客户端: {modbus_host}:{modbus_port}")
+
+            elif MODBUS_TYPE == 'RTU':
+                port = MODBUS_RTU_CONFIG['port']
+                baudrate = MODBUS_RTU_CONFIG['baudrate']
+                bytesize = MODBUS_RTU_CONFIG['bytesize']
+                parity = MODBUS_RTU_CONFIG['parity']
+                stopbits = MODBUS_RTU_CONFIG['stopbits']
+                timeout = MODBUS_RTU_CONFIG['timeout']
+
+                _modbus_client = AsyncModbusSerialClient(
+                    port=port,
+                    baudrate=baudrate,
+                    bytesize=bytesize,
+                    parity=parity,
+                    stopbits=stopbits,
+                    timeout=timeout,
+                    reconnect_delay=0
+                )
+                logger.debug(f"🔗 创建 Modbus RTU 客户端: {port} ({baudrate},{bytesize},{parity},{stopbits})")
 
-    def __ne__(self, other):
-        return self.name != other
+            else:
+                logger.error(f"❌ 不支持的 Modbus 类型: {MODBUS_TYPE}")
+                return None
 
-    def __lt__(self, other):
-        return self.name < other
+            _read_fns.update({
+                3: _modbus_client.read_holding_registers,  # 读保持寄存器
+                4: _modbus_client.read_input_registers,    # 读输入寄存器
+                1: _modbus_client.read_coils,              # 读线圈
+                2: _modbus_client.read_discrete_inputs,    # 读离散输入
+            })
+        except Exception as e:
+            logger.error(f"❌ 创建 Modbus 客户端失败: {e}")
+            return None
+    return _modbus_client
 
-    def __le__(self, other):
-        return self.name <= other
 
-    def __gt__(self, other):
-        return self.name > other
+async def _connect_modbus_client():
+    """
+    返回已连接的共享客户端
 
-    def __ge__(self, other):
-        return self.name >= other
+    连接失败后按指数退避（最长 retry_interval 秒），期间的请求直接失败，
+    不会每个 OID 都阻塞在连接超时上。
+    """
+    global _next_connect_time, _connect_failures
+    client = _get_modbus_client()
+    if client is None:
+        return None
+    if client.connected:
+        return client
+
+    async with _connect_lock:
+        # 等待锁期间其他协程可能已完成连接
+        if client.connected:
+            return client
+
+        now = time.monotonic()
+        if now < _next_connect_time:
+            return None
 
-    def _get_modbus_client(self):
-        """获取或创建 Modbus 客户端"""
-        if self.modbus_client is None:
-            try:
-                # 从全局配置中获取 Modbus 连接信息
-                if MODBUS_TYPE == 'TCP':
-                    modbus_host = MODBUS_TCP_CONFIG['server_ip']
-                    modbus_port = MODBUS_TCP_CONFIG['port']
-                    timeout = MODBUS_TCP_CONFIG['timeout']
-
-                    self.modbus_client = ModbusTcpClient(
-                        host=modbus_host,
-                        port=modbus_port,
-                        timeout=timeout
-                    )
-                    logger.debug(f"🔗 创建 Modbus TCP 客户端: {modbus_host}:{modbus_port}")
-
-                elif MODBUS_TYPE == 'RTU':
-                    port = MODBUS_RTU_CONFIG['port']
-                    baudrate = MODBUS_RTU_CONFIG['baudrate']
-                    bytesize = MODBUS_RTU_CONFIG['bytesize']
-                    parity = MODBUS_RTU_CONFIG['parity']
-                    stopbits = MODBUS_RTU_CONFIG['stopbits']
-                    timeout = MODBUS_RTU_CONFIG['timeout']
-
-                    self.modbus_client = ModbusSerialClient(
-                        port=port,
-                        baudrate=baudrate,
-                        bytesize=bytesize,
-                        parity=parity,
-                        stopbits=stopbits,
-                        timeout=timeout
-                    )
-                    logger.debug(f"🔗 创建 Modbus RTU 客户端: {port} ({baudrate},{bytesize},{parity},{stopbits})")
+        if not await client.connect():
+            _connect_failures += 1
+            delay = min(2 ** (_connect_failures - 1), _MODBUS_CONFIG['retry_interval'])
+            _next_connect_time = now + delay
+            logger.error(f"❌ Modbus 连接失败，{delay} 秒后重试")
+            return None
 
-                else:
-                    logger.error(f"❌ 不支持的 Modbus 类型: {MODBUS_TYPE}")
-                    return None
-            except Exception as e:
-                logger.error(f"❌ 创建 Modbus 客户端失败: {e}")
-                return None
-        return self.modbus_client
+        _next_connect_time = 0.0
+        _connect_failures = 0
+        if MODBUS_TYPE == 'TCP':
+            _tune_modbus_socket(client.ctx.transport.get_extra_info('socket'))
+        logger.info("🔗 Modbus 连接已建立")
+        return client
 
-    def _read_modbus_value(self):
-        """从 Modbus 设备读取原始值"""
-        # 如果是通讯状态 OID，不需要读取 Modbus
-        if self.modbus_config is None:
-            return 1  # 通讯状态固定返回 1（正常）
 
-        client = self._get_modbus_client()
+def _tune_modbus_socket(sock):
+    """关闭 Nagle 算法，并开启 TCP keepalive 以便空闲时也能发现断线"""
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, _TCP_KEEPIDLE)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, _TCP_KEEPINTVL)
+    except OSError as e:
+        logger.warning(f"⚠️  设置 Modbus 套接字选项失败: {e}")
+
+
+async def _request_group(group):
+    """按功能码发送分组读取请求，不支持的功能码返回 None"""
+    read_fn = _read_fns.get(group['function_code'])
+    if read_fn is None:
+        logger.error(f"❌ 不支持的功能码: {group['function_code']}")
+        return None
+    return await read_fn(group['start'], count=group['count'], device_id=group['unit_id'])
+
+
+async def _fetch_group(group):
+    """发送分组读取请求并返回 pymodbus 响应；无法连接时返回 None，连接中断时重连并重试一次"""
+    # 共享连接通常已建立，只有未连接时才进入连接流程
+    client = _modbus_client
+    if client is None or not client.connected:
+        client = await _connect_modbus_client()
         if client is None:
             return None
-            
-        try:
-            # 连接到 Modbus 设备
-            if not client.connected:
-                if not client.connect():
-                    logger.error(f"❌ Modbus 连接失败: {self.description}")
-                    return None
-            
-            # 读取寄存器
-            unit_id = self.modbus_config['unit_id']
-            register = self.modbus_config['register_address']
-            function_code = self.modbus_config['function_code']
 
-            logger.debug(f"🔍 读取 Modbus: {self.description} "
-                        f"(单元{unit_id}, 寄存器0x{register:X}, 功能码{function_code})")
-            
-            if function_code == 3:  # 读保持寄存器
-                result = client.read_holding_registers(register, count=1, device_id=unit_id)
-            elif function_code == 4:  # 读输入寄存器
-                result = client.read_input_registers(register, count=1, device_id=unit_id)
-            elif function_code == 1:  # 读线圈
-                result = client.read_coils(register, count=1, device_id=unit_id)
-            elif function_code == 2:  # 读离散输入
-                result = client.read_discrete_inputs(register, count=1, device_id=unit_id)
-            else:
-                logger.error(f"❌ 不支持的功能码: {function_code}")
-                return None
-            
-            if result.isError():
-                logger.error(f"❌ Modbus 读取错误: {result}")
-                return None
-            
-            # 获取原始值
-            if function_code in [1, 2]:  # 布尔值
-                raw_value = result.bits[0]
-            else:  # 寄存器值
-                raw_value = result.registers[0]
-            
-            logger.debug(f"📥 Modbus 读取成功: {self.description} = {raw_value}")
-            return raw_value
-            
-        except ModbusException as e:
-            logger.error(f"❌ Modbus 异常: {self.description} - {e}")
+    try:
+        return await _request_group(group)
+    except ConnectionException as e:
+        # 连接被对端关闭或中断：关闭后立即重连一次再重试
+        logger.warning(f"⚠️  Modbus 连接中断，正在重连: {e}")
+        client.close()
+        if await _connect_modbus_client() is None:
             return None
-        except Exception as e:
-            logger.error(f"❌ 读取异常: {self.description} - {e}")
+        return await _request_group(group)
+
+
+async def _read_group(group):
+    """
+    一次读取整个分组，返回按成员顺序解码后的值
+
+    读取失败返回 None；设备返回非法数据地址 / 非法数据值异常时返回 _REJECTED。
+    """
+    try:
+        count = group['count']
+        function_code = group['function_code']
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🔍 分组读取 Modbus: 单元{group['unit_id']}, 寄存器0x{group['start']:X}, "
+                        f"数量{count}, 功能码{function_code} ({len(group['members'])} 个 OID)")
+
+        result = await _fetch_group(group)
+        if result is None:
+            return None
+        if result.isError():
+            logger.error(f"❌ Modbus 读取错误: 单元{group['unit_id']}, 寄存器0x{group['start']:X} - {result}")
+            if getattr(result, 'exception_code', None) in _SPLIT_EXCEPTION_CODES:
+                return _REJECTED
             return None
 
-    def _process_value(self, raw_value):
-        """处理原始值"""
-        if raw_value is None:
+        # 整个分组一次解码
+        if function_code in [1, 2]:  # 布尔值
+            return group['decode'](result.bits)
+        registers = result.registers
+        return group['decode'](struct.pack(f'>{count}H', *registers[:count]))
+
+    except ModbusException as e:
+        logger.error(f"❌ Modbus 异常: 单元{group['unit_id']}, 寄存器0x{group['start']:X} - {e}")
+        return None
+    except Exception as e:
+        logger.error(f"❌ 读取异常: 单元{group['unit_id']}, 寄存器0x{group['start']:X} - {e}")
+        return None
+
+
+async def _read_modbus_group(group_index):
+    """
+    读取读取计划中的一个分组，返回按成员顺序解码后的值
+
+    设备拒绝整组读取时，该分组改为逐个成员读取，
+    单个无法读取的地址只影响对应的 OID，不会拖累同组的其他 OID；
+    每隔 retry_interval 秒重新尝试整组读取，设备恢复后回到一次读取整组。
+    """
+    group = MODBUS_READ_PLAN[group_index]
+    split = _split_groups.get(group_index)
+    if split is None or time.monotonic_ns() >= split[0]:
+        values = await _read_group(group)
+        if values is not _REJECTED:
+            if split is not None and values is not None:
+                del _split_groups[group_index]
+                logger.info(f"✅ 分组读取已恢复: 单元{group['unit_id']}, 寄存器0x{group['start']:X}, "
+                            f"数量{group['count']}")
+            return values
+        if len(group['members']) == 1:
             return None
+        if split is None:
+            logger.warning(f"⚠️  设备拒绝分组读取: 单元{group['unit_id']}, 寄存器0x{group['start']:X}, "
+                           f"数量{group['count']}，改为逐个 OID 读取")
+            parts = split_read_group(group)
+        else:
+            parts = split[1]
+        retry_at = time.monotonic_ns() + _MODBUS_CONFIG['retry_interval'] * 1_000_000_000
+        _split_groups[group_index] = (retry_at, parts)
+    else:
+        parts = split[1]
+
+    values = []
+    for part in parts:
+        part_values = await _read_group(part)
+        # 无法读取的成员取值为 None，对应 OID 返回通讯中断错误代码
+        values.append(None if part_values is None or part_values is _REJECTED else part_values[0])
+    if all(value is None for value in values):
+        return None
+    return values
+
+
+async def _refresh_group(group_index):
+    """读取一个分组并写入缓存；该分组正在被其他 PDU 读取时等待同一次读取"""
+    task = _inflight_reads.get(group_index)
+    if task is not None:
+        await task
+        return
+
+    task = asyncio.ensure_future(_read_modbus_group(group_index))
+    _inflight_reads[group_index] = task
+    try:
+        values = await task
+    finally:
+        del _inflight_reads[group_index]
+    _group_cache[group_index] = (time.monotonic_ns(), values)
 
-        try:
-            # 首先根据数据类型处理原始值
-            processed_raw_value = self._convert_raw_data_type(raw_value)
 
-            processing_type = self.data_processing['type']
+async def _refresh_stale_groups(handlers):
+    """并发刷新这些处理器所需的、已过期或从未读取的分组（系统 OID 的 read_slot 为 None，直接跳过）"""
+    now = time.monotonic_ns()
+    stale = set()
+    for handler in handlers:
+        if handler.read_slot is None:
+            continue
+        group_index = handler.read_slot[0]
+        entry = _group_cache.get(group_index)
+        # 读取失败的结果不复用，下一个 PDU 重新读取
+        if entry is None or entry[1] is None or now - entry[0] >= handler.cache_ttl_ns:
+            stale.add(group_index)
 
-            if processing_type == 'multiply':
-                # 乘法处理
-                coefficient = self.data_processing['coefficient']
-                offset = self.data_processing['offset']
-                processed_value = processed_raw_value * coefficient + offset
+    if stale:
+        await asyncio.gather(*(_refresh_group(group_index) for group_index in stale))
 
-                # 小数位处理
-                decimal_places = self.data_processing.get('decimal_places', 0)
-                if decimal_places > 0:
-                    processed_value = round(processed_value, decimal_places)
 
-                logger.debug(f"🔄 数据处理: {raw_value} → {processed_raw_value} × {coefficient} + {offset} = {processed_value}")
+def _close_modbus_client():
+    """关闭共享的 Modbus 连接"""
+    if _modbus_client is not None and _modbus_client.connected:
+        _modbus_client.close()
+        logger.debug("🔌 关闭 Modbus 连接")
 
-            elif processing_type == 'direct':
-                # 直接映射
-                processed_value = processed_raw_value
-                logger.debug(f"➡️  直接映射: {raw_value} → {processed_raw_value}")
+# ============================================================================
+# 数据转换
+# ============================================================================
 
-            elif processing_type == 'communication_status':
-                # 通讯状态（固定返回1表示正常）
-                processed_value = 1
-                logger.debug(f"📡 通讯状态: {processed_value}")
+# 各 SNMP 版本的值构造类：proto_ver -> SimpleNamespace(Integer=..., OctetString=..., ...)
+_CTOR_CACHE = {}
 
-            else:
-                logger.warning(f"⚠️  未知处理类型: {processing_type}")
-                processed_value = processed_raw_value
 
-            return processed_value
+def _ctors(proto_ver):
+    """获取指定 SNMP 版本的值构造类（首次使用时解析并缓存）"""
+    ctors = _CTOR_CACHE.get(proto_ver)
+    if ctors is None:
+        mod = api.PROTOCOL_MODULES[proto_ver]
+        # SNMPv1 模块中为 Gauge/Counter，SNMPv2c 模块中为 Gauge32/Counter32
+        ctors = SimpleNamespace(Integer=mod.Integer,
+                                Gauge=getattr(mod, 'Gauge', None) or mod.Gauge32,
+                                Counter=getattr(mod, 'Counter', None) or mod.Counter32,
+                                OctetString=mod.OctetString, TimeTicks=mod.TimeTicks)
+        _CTOR_CACHE[proto_ver] = ctors
+    return ctors
 
-        except Exception as e:
-            logger.error(f"❌ 数据处理异常: {self.description} - {e}")
-            return None
 
-    def _convert_raw_data_type(self, raw_value):
-        """根据配置的数据类型转换原始值"""
-        if self.modbus_config is None:
-            return raw_value
+def _communication_status(value):
+    """通讯状态（固定返回 1 表示正常）"""
+    return 1
 
-        try:
-            data_type = self.modbus_config.get('data_type', 'uint16')
 
-            if data_type == 'int16':
-                # 有符号 16 位整数 (-32768 到 32767)
-                if raw_value > 32767:
-                    converted_value = raw_value - 65536
-                else:
-                    converted_value = raw_value
-                logger.debug(f"📊 数据类型转换 (int16): {raw_value} → {converted_value}")
-
-            elif data_type == 'uint16':
-                # 无符号 16 位整数 (0 到 65535)
-                converted_value = raw_value
-                logger.debug(f"📊 数据类型转换 (uint16): {raw_value} → {converted_value}")
-
-            elif data_type == 'int32':
-                # 有符号 32 位整数（需要读取两个寄存器）
-                # 这里假设 raw_value 已经是组合后的 32 位值
-                if raw_value > 2147483647:
-                    converted_value = raw_value - 4294967296
-                else:
-                    converted_value = raw_value
-                logger.debug(f"📊 数据类型转换 (int32): {raw_value} → {converted_value}")
+def _build_processor(record):
+    """按处理类型返回数据处理函数，直接映射返回 None（无需处理）"""
+    processing_type = record.processing_type
+    if processing_type == 'multiply':
+        # 乘法处理（系数、偏移量和小数位数已在加载配置时绑定）
+        return record.transform
+    if processing_type == 'communication_status':
+        return _communication_status
+    if processing_type != 'direct':
+        logger.warning(f"⚠️  未知处理类型: {processing_type}，按直接映射处理")
+    return None
 
-            elif data_type == 'uint32':
-                # 无符号 32 位整数
-                converted_value = raw_value
-                logger.debug(f"📊 数据类型转换 (uint32): {raw_value} → {converted_value}")
 
-            elif data_type == 'float32':
-                # 32 位浮点数（需要特殊处理）
-                # 这里假设 raw_value 是已经转换的浮点数
-                converted_value = float(raw_value)
-                logger.debug(f"📊 数据类型转换 (float32): {raw_value} → {converted_value}")
+def _to_snmp_number(scale_factor):
+    """数值类 SNMP 类型：浮点数乘以比例因子后取整"""
+    def convert(value):
+        if isinstance(value, float):
+            return int(value * scale_factor)
+        return int(value)
+    return convert
 
-            else:
-                # 默认按 uint16 处理
-                converted_value = raw_value
-                logger.debug(f"📊 数据类型转换 (默认 uint16): {raw_value} → {converted_value}")
 
-            return converted_value
+def _to_snmp_text(value):
+    """OctetString：浮点数保留两位小数"""
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
 
-        except Exception as e:
-            logger.error(f"❌ 数据类型转换异常: {self.description} - {e}")
-            return raw_value
-
-    def _convert_to_snmp_value(self, processed_value, proto_ver):
-        """将处理后的值转换为 SNMP 值"""
-        if processed_value is None:
-            # 返回 Modbus 通讯中断错误代码
-            return api.PROTOCOL_MODULES[proto_ver].Integer(-99998)
+
+# 配置中的 SNMP 数据类型 -> _ctors() 中的构造类名，Integer32 及未知类型均使用 Integer
+_SNMP_CTOR_NAMES = {
+    'OctetString': 'OctetString',
+    'Gauge32': 'Gauge',
+    'Counter32': 'Counter',
+}
+
+
+def _build_pipeline(process, snmp_data_type, scale_factor=1):
+    """
+    构建从原始值到 SNMP 值的完整转换函数 pipeline(raw_value, proto_ver)
+
+    数据处理和 SNMP 类型在初始化时确定并合成为一个函数，请求时只需一次调用；
+    各协议版本的构造类首次使用时解析并缓存。
+    """
+    ctor_name = _SNMP_CTOR_NAMES.get(snmp_data_type, 'Integer')
+    if ctor_name == 'OctetString':
+        convert = _to_snmp_text
+    else:
+        convert = _to_snmp_number(scale_factor)
+
+    ctors = {}  # proto_ver -> 构造类
+
+    if process is None:
+        def pipeline(value, proto_ver):
+            ctor = ctors.get(proto_ver)
+            if ctor is None:
+                ctor = ctors[proto_ver] = getattr(_ctors(proto_ver), ctor_name)
+            return ctor(convert(value))
+    else:
+        def pipeline(value, proto_ver):
+            ctor = ctors.get(proto_ver)
+            if ctor is None:
+                ctor = ctors[proto_ver] = getattr(_ctors(proto_ver), ctor_name)
+            return ctor(convert(process(value)))
+
+    return pipeline
+
+
+# ============================================================================
+# 核心类定义
+# ============================================================================
+
+class ModbusOIDHandler:
+    """
+    Modbus OID 处理器
+
+    负责处理 SNMP OID 到 Modbus 寄存器的映射和数据转换。
+    每个实例对应一个 OID，包含该 OID 的所有配置信息和处理逻辑。
+
+    主要功能：
+    1. 存储 OID 配置信息（寄存器地址、数据类型、处理方式等）
+    2. 实时读取 Modbus 数据
+    3. 数据类型转换（int16/uint16/int32/uint32/float32）
+    4. 数据处理（乘法、直接映射、通讯状态等）
+    5. SNMP 数据类型转换
+    6. 错误处理和日志记录
+    """
+
+    # OID 表中处理器数量随配置增长，固定属性布局以节省内存并加快属性访问
+    __slots__ = ('record', 'oid_str', 'name', 'description', '_pipeline',
+                 'read_slot', 'cache_ttl_ns')
+
+    def __init__(self, record):
+        """
+        初始化 OID 处理器
         
-        try:
-            snmp_data_type = self.snmp_config.get('data_type', 'Integer32')
-            scale_factor = self.snmp_config.get('scale_factor', 1)
-            
-            if snmp_data_type == 'Integer32':
-                if isinstance(processed_value, float):
-                    int_value = int(processed_value * scale_factor)
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].Integer(int_value)
-                    logger.debug(f"🔄 SNMP转换: {processed_value} × {scale_factor} = {int_value} (Integer)")
-                else:
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].Integer(int(processed_value))
-                    logger.debug(f"🔄 SNMP转换: {processed_value} → {int(processed_value)} (Integer)")
-                    
-            elif snmp_data_type == 'OctetString':
-                if isinstance(processed_value, float):
-                    str_value = f"{processed_value:.2f}"
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].OctetString(str_value)
-                    logger.debug(f"🔄 SNMP转换: {processed_value} → '{str_value}' (OctetString)")
-                else:
-                    str_value = str(processed_value)
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].OctetString(str_value)
-                    logger.debug(f"🔄 SNMP转换: {processed_value} → '{str_value}' (OctetString)")
-                    
-            elif snmp_data_type == 'Gauge32':
-                if isinstance(processed_value, float):
-                    int_value = int(processed_value * scale_factor)
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].Gauge(int_value)
-                    logger.debug(f"🔄 SNMP转换: {processed_value} × {scale_factor} = {int_value} (Gauge)")
-                else:
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].Gauge(int(processed_value))
-                    logger.debug(f"🔄 SNMP转换: {processed_value} → {int(processed_value)} (Gauge)")
-
-            elif snmp_data_type == 'Counter32':
-                if isinstance(processed_value, float):
-                    int_value = int(processed_value * scale_factor)
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].Counter(int_value)
-                    logger.debug(f"🔄 SNMP转换: {processed_value} × {scale_factor} = {int_value} (Counter)")
-                else:
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].Counter(int(processed_value))
-                    logger.debug(f"🔄 SNMP转换: {processed_value} → {int(processed_value)} (Counter)")
+        Args:
+            record: 来自 config_loader 的 OidRecord
+        """
+        self.record = record
+        self.oid_str = record.oid
+        self.name = record.oid_tuple
+        self.description = record.description
+
+        # 处理类型和 SNMP 类型在初始化时合成为一个函数，请求时不再按字符串分支；
+        # 数据类型（符号、浮点格式）在分组解码时已处理
+        self._pipeline = _build_pipeline(_build_processor(record), record.snmp_data_type)
+
+        # 在分组读取计划中的位置（通讯状态 OID 无需读取寄存器，为 None）
+        if record.register_address is not None:
+            self.read_slot = _READ_SLOTS[self.name]
+            if record.cache_ttl_ms is not None:
+                self.cache_ttl_ns = record.cache_ttl_ms * 1_000_000
             else:
-                # 默认使用 Integer
-                snmp_value = api.PROTOCOL_MODULES[proto_ver].Integer(int(processed_value))
-                logger.debug(f"🔄 SNMP转换: 未知类型，使用默认 Integer: {processed_value} → {int(processed_value)}")
-            
-            return snmp_value
-            
-        except Exception as e:
-            logger.error(f"❌ SNMP 值转换异常: {self.description} - {e}")
-            return api.PROTOCOL_MODULES[proto_ver].Integer(-99998)  # Modbus 通讯中断错误代码
+                self.cache_ttl_ns = _READ_TTL_NS
+        else:
+            self.read_slot = None
+
+    def summary(self):
+        """一行描述本 OID 的配置，用于启动日志"""
+        record = self.record
+        if record.register_address is not None:
+            source = (f"单元{record.unit_id} 寄存器0x{record.register_address:X} "
+                      f"功能码{record.function_code} {record.data_type}")
+        else:
+            source = "无需读取寄存器（通讯状态 OID）"
+        return (f"{self.oid_str} -> {self.description} | {source} | "
+                f"处理: {record.processing_type} | SNMP类型: {record.snmp_data_type}")
+
+    def stats(self):
+        """返回本 OID 的诊断信息：缓存的分组读取时间和最近的失败事件"""
+        read_ns = None
+        if self.read_slot is not None:
+            entry = _group_cache.get(self.read_slot[0])
+            if entry is not None:
+                read_ns = entry[0]
+        return {
+            'oid': self.oid_str,
+            'description': self.description,
+            'last_read_ns': read_ns,
+            'recent_errors': [(t, msg) for t, oid, msg in _LAST_EVENTS if oid == self.oid_str],
+        }
+
+    def _read_modbus_value(self):
+        """
+        取出本 OID 的原始值
+
+        所在分组已由 _refresh_stale_groups 在处理 PDU 前读取到缓存中。
+        """
+        # 如果是通讯状态 OID，不需要读取 Modbus
+        if self.read_slot is None:
+            return 1  # 通讯状态固定返回 1（正常）
+
+        group_index, member_index = self.read_slot
+        entry = _group_cache.get(group_index)
+        if entry is None or entry[1] is None:
+            return None
+        values = entry[1]
+
+        # 分组读取时已按数据类型解码
+        raw_value = values[member_index]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📥 Modbus 读取成功: {self.description} = {raw_value}")
+        return raw_value
 
     def __call__(self, proto_ver):
         """
         SNMP 回调函数：当收到对此 OID 的请求时调用
         实时从 Modbus 设备读取数据并返回
         """
-        logger.info(f"🔍 SNMP 请求: {self.description} ({self.oid_str})")
+        logger.debug("🔍 SNMP 请求: %s (%s)", self.description, self.oid_str)
         
         # 从 Modbus 设备读取原始值
         raw_value = self._read_modbus_value()
         
-        # 处理数据
-        processed_value = self._process_value(raw_value)
-        
-        # 转换为 SNMP 值
-        snmp_value = self._convert_to_snmp_value(processed_value, proto_ver)
-        
-        # 缓存结果
-        self.last_value = processed_value
-        if processed_value is None:
-            self.last_error = f"读取失败: {raw_value}"
+        # 处理数据并转换为 SNMP 值（读取或处理失败时返回 Modbus 通讯中断错误代码）
+        if raw_value is None:
+            _LAST_EVENTS.append((time.time(), self.oid_str, "Modbus 读取失败"))
+            snmp_value = _ctors(proto_ver).Integer(-99998)
         else:
-            self.last_error = None
+            try:
+                snmp_value = self._pipeline(raw_value, proto_ver)
+            except Exception as e:
+                logger.error(f"❌ 数据处理异常: {self.description} - {e}")
+                _LAST_EVENTS.append((time.time(), self.oid_str, f"数据处理异常: {e}"))
+                snmp_value = _ctors(proto_ver).Integer(-99998)
         
-        logger.info(f"✅ SNMP 响应: {self.description} = {processed_value} "
-                   f"(原值: {raw_value})")
+        logger.debug("✅ SNMP 响应: %s = %s (原值: %s)", self.description, snmp_value, raw_value)
+        count = next(_response_counter)
+        if count % _RESPONSE_LOG_EVERY == 0:
+            logger.info("📊 已响应 %d 次业务 OID 请求，最近一次: %s = %s",
+                        count, self.description, snmp_value)
         
         return snmp_value
 
-    def cleanup(self):
-        """清理资源"""
-        if self.modbus_client and self.modbus_client.connected:
-            self.modbus_client.close()
-            logger.debug(f"🔌 关闭 Modbus 连接: {self.description}")
-
 
 # 系统 OID 处理器（基于配置的通用处理器）
 class SystemOIDHandler:
     """处理系统 OID 和固定值 OID"""
 
+    __slots__ = ('oid_str', 'name', 'description', 'oid_type', 'snmp_data_type', 'type_tag',
+                 'snmp_type_tag', 'value', 'birthday_ns', '_tz', '_tz_suffix', '_last_sec', '_last_str')
+
+    read_slot = None  # 系统 OID 无需读取 Modbus
+
     def __init__(self, oid_config):
         """
         初始化系统 OID 处理器
@@ -424,131 +632,252 @@ class SystemOIDHandler:
             oid_config: 来自 config.py 的系统 OID 配置
         """
         self.oid_str = oid_config['oid']
-        self.name = tuple(int(x) for x in oid_config['oid'].strip('.').split('.'))
+        self.name = oid_config['oid_tuple']
         self.description = oid_config['description']
         self.oid_type = oid_config['type']
         self.snmp_data_type = oid_config['snmp_data_type']
+        self.type_tag = oid_config['type_tag']
+        self.snmp_type_tag = oid_config['snmp_type_tag']
 
         # 固定值类型的配置
-        if self.oid_type == 'fixed_value':
+        if self.type_tag == _TAG_FIXED_VALUE:
             self.value = oid_config['value']
-        elif self.oid_type == 'uptime':
-            self.birthday = time.time()
-
-        logger.info(f"📋 注册系统 OID: {self.oid_str} -> {self.description}")
-        logger.info(f"   类型: {self.oid_type}")
-        logger.info(f"   SNMP数据类型: {self.snmp_data_type}")
-        if self.oid_type == 'fixed_value':
-            logger.info(f"   固定值: {self.value}")
-
-    def __eq__(self, other): return self.name == other
-    def __ne__(self, other): return self.name != other
-    def __lt__(self, other): return self.name < other
-    def __le__(self, other): return self.name <= other
-    def __gt__(self, other): return self.name > other
-    def __ge__(self, other): return self.name >= other
+        elif self.type_tag == _TAG_UPTIME:
+            self.birthday_ns = time.monotonic_ns()
+        elif self.type_tag == _TAG_UTC_TIME:
+            # 时区偏移和 tzinfo 在加载配置时已解析；时间字符串每秒只格式化一次
+            self._tz = TIMEZONE_CONFIG['tzinfo']
+            self._tz_suffix = TIMEZONE_CONFIG['timezone_offset']
+            self._last_sec = None
+            self._last_str = None
+
+    def summary(self):
+        """一行描述本 OID 的配置，用于启动日志"""
+        text = (f"{self.oid_str} -> {self.description} | 类型: {self.oid_type} | "
+                f"SNMP类型: {self.snmp_data_type}")
+        if self.type_tag == _TAG_FIXED_VALUE:
+            text += f" | 固定值: {self.value}"
+        return text
 
     def __call__(self, proto_ver):
         """
         SNMP 回调函数：返回配置的固定值或计算值
         """
-        logger.debug(f"🔍 系统 OID 请求: {self.description} ({self.oid_str})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🔍 系统 OID 请求: {self.description} ({self.oid_str})")
 
         try:
-            if self.oid_type == 'fixed_value':
-                # 返回固定值
-                if self.snmp_data_type == 'OctetString':
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].OctetString(str(self.value))
-                elif self.snmp_data_type == 'Integer':
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].Integer(int(self.value))
+            ctors = _ctors(proto_ver)
+            type_tag = self.type_tag
+            if type_tag == _TAG_FIXED_VALUE:
+                # 返回固定值（Integer 以外的类型默认使用 OctetString）
+                if self.snmp_type_tag == _TAG_SNMP_INTEGER:
+                    snmp_value = ctors.Integer(int(self.value))
                 else:
-                    # 默认使用 OctetString
-                    snmp_value = api.PROTOCOL_MODULES[proto_ver].OctetString(str(self.value))
+                    snmp_value = ctors.OctetString(str(self.value))
 
-                logger.debug(f"✅ 系统 OID 响应: {self.description} = {self.value}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"✅ 系统 OID 响应: {self.description} = {self.value}")
 
-            elif self.oid_type == 'uptime':
-                # 计算运行时间
-                uptime_ticks = int((time.time() - self.birthday) * 100)
-                snmp_value = api.PROTOCOL_MODULES[proto_ver].TimeTicks(uptime_ticks)
+            elif type_tag == _TAG_UPTIME:
+                # 计算运行时间（TimeTicks 单位为 1/100 秒）
+                uptime_ticks = (time.monotonic_ns() - self.birthday_ns) // 10_000_000
+                snmp_value = ctors.TimeTicks(uptime_ticks)
 
-                logger.debug(f"✅ 系统 OID 响应: {self.description} = {uptime_ticks} ticks")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"✅ 系统 OID 响应: {self.description} = {uptime_ticks} ticks")
 
-            elif self.oid_type == 'utc_time':
+            elif type_tag == _TAG_UTC_TIME:
                 # 返回 UTC 时间格式：YYYYMMDDTHHMMSSZ+08，举例20100607T152000+08
                 # 根据配置的时区偏移生成时间字符串
 
-                # 获取时区偏移配置
-                timezone_offset = TIMEZONE_CONFIG.get('timezone_offset', '+00')
+                # 同一秒内复用已格式化的字符串
+                sec = int(time.time())
+                if sec != self._last_sec:
+                    # 生成时间字符串：YYYYMMDDTHHMMSS+时区偏移
+                    local_time = datetime.datetime.fromtimestamp(sec, self._tz)
+                    self._last_str = local_time.strftime('%Y%m%dT%H%M%S') + self._tz_suffix
+                    self._last_sec = sec
+                utc_time_str = self._last_str
 
-                # 解析时区偏移
-                if timezone_offset.startswith('+') or timezone_offset.startswith('-'):
-                    sign = 1 if timezone_offset[0] == '+' else -1
-                    hours = int(timezone_offset[1:3])
-                    offset_minutes = sign * hours * 60
-                else:
-                    offset_minutes = 0
+                snmp_value = ctors.OctetString(utc_time_str)
 
-                # 创建时区对象
-                target_timezone = datetime.timezone(datetime.timedelta(minutes=offset_minutes))
-
-                # 获取当前时间并转换到目标时区
-                utc_now = datetime.datetime.now(datetime.timezone.utc)
-                local_time = utc_now.astimezone(target_timezone)
-
-                # 生成时间字符串：YYYYMMDDTHHMMSS+时区偏移
-                time_str = local_time.strftime('%Y%m%dT%H%M%S')
-                utc_time_str = f"{time_str}{timezone_offset}"
-
-                snmp_value = api.PROTOCOL_MODULES[proto_ver].OctetString(utc_time_str)
-
-                logger.debug(f"✅ 系统 OID 响应: {self.description} = {utc_time_str} (时区: {timezone_offset})")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"✅ 系统 OID 响应: {self.description} = {utc_time_str} (时区: {self._tz_suffix})")
 
             else:
                 # 未知类型，返回错误
                 logger.error(f"❌ 未知的系统 OID 类型: {self.oid_type}")
-                snmp_value = api.PROTOCOL_MODULES[proto_ver].OctetString("Unknown Type")
+                snmp_value = ctors.OctetString("Unknown Type")
 
             return snmp_value
 
         except Exception as e:
             logger.error(f"❌ 系统 OID 处理异常: {self.description} - {e}")
-            return api.PROTOCOL_MODULES[proto_ver].OctetString("Error")
+            return _ctors(proto_ver).OctetString("Error")
+
+
+# 按类型划分的处理器列表，由 create_mib_handlers 填充
+_system_handlers = []
+_modbus_handlers = []
 
 
 def create_mib_handlers():
     """根据配置创建 MIB 处理器"""
-    handlers = []
+    _system_handlers.clear()
+    _modbus_handlers.clear()
+
+    # 加载配置时跳过的 OID 节（导入配置时日志尚未配置，在这里统一记录）
+    for reason in SKIPPED_OID_SECTIONS:
+        logger.error(f"❌ 跳过 OID 配置: {reason}")
 
     # 添加系统 OID 处理器（基于配置）
     for oid_config in SYSTEM_OID_MAPPING:
         try:
-            handler = SystemOIDHandler(oid_config)
-            handlers.append(handler)
+            _system_handlers.append(SystemOIDHandler(oid_config))
         except Exception as e:
             logger.error(f"❌ 创建系统 OID 处理器失败: {oid_config.get('oid', 'unknown')} - {e}")
 
     # 添加 Modbus OID 处理器
-    for oid_config in SNMP_OID_MAPPING:
+    for record in SNMP_OID_MAPPING:
         try:
-            handler = ModbusOIDHandler(oid_config)
-            handlers.append(handler)
+            _modbus_handlers.append(ModbusOIDHandler(record))
         except Exception as e:
-            logger.error(f"❌ 创建 Modbus OID 处理器失败: {oid_config.get('oid', 'unknown')} - {e}")
+            logger.error(f"❌ 创建 Modbus OID 处理器失败: {record.oid} - {e}")
 
     # 按 OID 排序
-    handlers.sort(key=lambda x: x.name)
-
-    logger.info(f"📋 成功创建 {len(handlers)} 个 OID 处理器")
-    logger.info(f"   - 系统 OID: {len(SYSTEM_OID_MAPPING)} 个")
-    logger.info(f"   - Modbus OID: {len([h for h in handlers if isinstance(h, ModbusOIDHandler)])} 个")
+    handlers = sorted(_system_handlers + _modbus_handlers, key=lambda x: x.name)
+
+    # 汇总为一条日志输出，OID 很多时启动不会被逐条日志拖慢
+    logger.info(f"📋 成功创建 {len(handlers)} 个 OID 处理器 "
+                f"(系统 OID: {len(_system_handlers)} 个, Modbus OID: {len(_modbus_handlers)} 个, "
+                f"Modbus 分组读取: {len(MODBUS_READ_PLAN)} 组)")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("📋 OID 映射表:\n%s", "\n".join(f"   {h.summary()}" for h in handlers))
     return handlers
 
 
+def _build_mib_index(handlers):
+    """将按 OID 排序的处理器列表设为当前 MIB，并建立 GET / GETNEXT 查找表"""
+    global mib_handlers, mib_handler_keys, mib_handlers_idx, mib_handlers_next
+    mib_handlers = handlers
+    mib_handler_keys = [handler.name for handler in handlers]  # 与 mib_handlers 并列的有序 OID 元组，供 bisect 使用
+    # GET 精确匹配，一次字典查找。键是 int 元组，哈希与比较都在 C 层完成，
+    # 1 万个 OID 时单次查找约 0.1µs，远小于一次 BER 解码，无需另做 C 扩展索引
+    mib_handlers_idx = {handler.name: handler for handler in handlers}
+    mib_handlers_next = {handler.name: i + 1 for i, handler in enumerate(handlers)}  # 已注册 OID -> 后继下标（GETNEXT）
+
+
+def _ber_header(data, pos):
+    """解析 pos 处 TLV 的头部（单字节标签），返回 (内容起始, 内容结束)"""
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        n = length & 0x7F
+        length = int.from_bytes(data[pos:pos + n], 'big')
+        pos += n
+    return pos, pos + length
+
+
+def _ber_tlv(tag, content):
+    """按定长格式编码一个 TLV"""
+    length = len(content)
+    if length < 0x80:
+        return bytes((tag, length)) + content
+    size = (length.bit_length() + 7) // 8
+    return bytes((tag, 0x80 | size)) + length.to_bytes(size, 'big') + content
+
+
+def _ber_integer(value):
+    """补码形式编码 INTEGER，长度取法与 pyasn1 编码器一致"""
+    size = value.bit_length() // 8 + 1
+    return _ber_tlv(0x02, value.to_bytes(size, 'big', signed=True))
+
+
+def _response_tail(whole_rsp):
+    """截取编码后响应中 request-id 之后的部分（error-status、error-index、变量绑定）"""
+    pos, _ = _ber_header(whole_rsp, 0)    # 进入 Message
+    _, pos = _ber_header(whole_rsp, pos)  # 跳过 version
+    _, pos = _ber_header(whole_rsp, pos)  # 跳过 community
+    pos, _ = _ber_header(whole_rsp, pos)  # 进入 PDU
+    _, pos = _ber_header(whole_rsp, pos)  # 跳过 request-id
+    return whole_rsp[pos:]
+
+
+def _assemble_response(msg_ver, community, request_id, tail):
+    """用请求的版本、团体名和 request-id 加上缓存的尾部拼出完整响应"""
+    pdu = _ber_tlv(_RESPONSE_PDU_TAG, _ber_integer(request_id) + tail)
+    return _ber_tlv(0x30, _ber_integer(msg_ver) + _ber_tlv(0x04, community) + pdu)
+
+
+# 正在处理的 SNMP 请求任务（保留引用，避免任务在完成前被回收）
+_pending_tasks = set()
+
+
+def _on_task_done(task):
+    """请求任务结束：移除引用并记录未处理的异常"""
+    _pending_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("❌ SNMP 请求处理异常", exc_info=task.exception())
+
+
 def snmp_callback(transport_dispatcher, transport_domain, transport_address, whole_msg):
-    """SNMP 请求回调函数"""
-    logger.debug(f"📨 收到 SNMP 请求: {transport_address}")
-    
+    """SNMP 请求回调函数：创建异步任务处理请求，等待 Modbus 读取时不阻塞其他请求"""
+    logger.debug("📨 收到 SNMP 请求: %s", transport_address)
+    task = transport_dispatcher.loop.create_task(
+        _handle_snmp_message(transport_dispatcher, transport_domain, transport_address, whole_msg)
+    )
+    _pending_tasks.add(task)
+    task.add_done_callback(_on_task_done)
+
+
+def _resolve_getnext(varbinds):
+    """
+    GETNEXT：为每个变量绑定找到后继 OID 的处理器
+
+    Returns:
+        (targets, end_of_mib)：targets 为 (响应 OID, 处理器, 无处理器时的响应值) 列表，
+        end_of_mib 为超出 MIB 末尾的变量绑定序号（从 1 开始）
+    """
+    # 变量绑定可能很多，循环内用到的表和方法先取到局部变量
+    handlers = mib_handlers
+    next_index = mib_handlers_next.get
+    keys = mib_handler_keys
+    end = len(handlers)
+    targets = []
+    end_of_mib = []
+    for error_index, (oid, val) in enumerate(varbinds, 1):
+        key = oid.asTuple()
+        # snmpwalk 每次都用上一个响应的 OID 请求，命中时直接查表，否则二分查找
+        next_idx = next_index(key)
+        if next_idx is None:
+            next_idx = bisect.bisect(keys, key)
+        if next_idx == end:
+            targets.append((oid, None, val))
+            end_of_mib.append(error_index)
+        else:
+            handler = handlers[next_idx]
+            targets.append((handler.name, handler, None))
+    return targets, end_of_mib
+
+
+def _resolve_get(varbinds, proto_ver):
+    """GET：按 OID 精确查找处理器，返回 (响应 OID, 处理器, 无处理器时的响应值) 列表"""
+    lookup = mib_handlers_idx.get
+    targets = []
+    for oid, _ in varbinds:
+        handler = lookup(oid.asTuple())
+        if handler is not None:
+            targets.append((oid, handler, None))
+        else:
+            logger.warning(f"⚠️  未找到 OID: {oid}")
+            # 返回未定义 OID 错误代码 -99997
+            targets.append((oid, None, _ctors(proto_ver).Integer(-99997)))
+    return targets
+
+
+async def _handle_snmp_message(transport_dispatcher, transport_domain, transport_address, whole_msg):
+    """处理一个 SNMP 数据报中的所有 PDU"""
     while whole_msg:
         msg_ver = api.decodeMessageVersion(whole_msg)
         if msg_ver in api.PROTOCOL_MODULES:
@@ -557,55 +886,63 @@ def snmp_callback(transport_dispatcher, transport_domain, transport_address, who
             logger.error(f"❌ 不支持的 SNMP 版本: {msg_ver}")
             return
         
-        req_msg, whole_msg = decoder.decode(whole_msg, asn1Spec=p_mod.Message())
-        rsp_msg = p_mod.apiMessage.get_response(req_msg)
-        rsp_pdu = p_mod.apiMessage.get_pdu(rsp_msg)
+        req_msg, whole_msg = decoder.decode(whole_msg, asn1Spec=_ASN1_SPECS[msg_ver])
         req_pdu = p_mod.apiMessage.get_pdu(req_msg)
-        var_binds = []
-        pending_errors = []
-        error_index = 0
+        # 先确定每个变量绑定对应的处理器：(响应 OID, 处理器, 无处理器时的响应值)
         
         # 处理 GETNEXT PDU
-        if req_pdu.isSameTypeWith(p_mod.GetNextRequestPDU()):
+        if req_pdu.isSameTypeWith(_GETNEXT_PDUS[msg_ver]):
             logger.debug("🔍 处理 GETNEXT 请求")
-            for oid, val in p_mod.apiPDU.get_varbinds(req_pdu):
-                error_index += 1
-                next_idx = bisect.bisect(mib_handlers, oid)
-                if next_idx == len(mib_handlers):
-                    var_binds.append((oid, val))
-                    pending_errors.append((p_mod.apiPDU.set_end_of_mib_error, error_index))
-                else:
-                    handler = mib_handlers[next_idx]
-                    var_binds.append((handler.name, handler(msg_ver)))
+            targets, end_of_mib = _resolve_getnext(p_mod.apiPDU.get_varbinds(req_pdu))
         
         # 处理 GET PDU
-        elif req_pdu.isSameTypeWith(p_mod.GetRequestPDU()):
+        elif req_pdu.isSameTypeWith(_GET_PDUS[msg_ver]):
             logger.debug("🔍 处理 GET 请求")
-            for oid, val in p_mod.apiPDU.get_varbinds(req_pdu):
-                error_index += 1
-                if oid in mib_handlers_idx:
-                    handler = mib_handlers_idx[oid]
-                    var_binds.append((oid, handler(msg_ver)))
-                else:
-                    logger.warning(f"⚠️  未找到 OID: {oid}")
-                    # 返回未定义 OID 错误代码 -99997
-                    undefined_value = api.PROTOCOL_MODULES[msg_ver].Integer(-99997)
-                    var_binds.append((oid, undefined_value))
+            targets = _resolve_get(p_mod.apiPDU.get_varbinds(req_pdu), msg_ver)
+            end_of_mib = ()
         else:
             logger.error("❌ 不支持的请求类型")
-            p_mod.apiPDU.set_error_status(rsp_pdu, "genErr")
-        
-        p_mod.apiPDU.set_varbinds(rsp_pdu, var_binds)
+            rsp_msg = p_mod.apiMessage.get_response(req_msg)
+            p_mod.apiPDU.set_error_status(p_mod.apiMessage.get_pdu(rsp_msg), "genErr")
+            transport_dispatcher.send_message(
+                encoder.encode(rsp_msg), transport_domain, transport_address
+            )
+            continue
         
-        # 提交错误索引到响应 PDU
-        for f, i in pending_errors:
-            f(rsp_pdu, i)
+        # 并发读取本 PDU 需要的所有过期分组，然后各处理器从缓存取值
+        await _refresh_stale_groups(handler for _, handler, _ in targets if handler is not None)
+        var_binds = [
+            (name, handler(msg_ver) if handler is not None else value)
+            for name, handler, value in targets
+        ]
         
-        transport_dispatcher.send_message(
-            encoder.encode(rsp_msg), transport_domain, transport_address
+        # 值的类型也放进键里，避免同值不同类型（如 Integer 与 Gauge32）命中同一条缓存
+        cache_key = (
+            msg_ver,
+            tuple(end_of_mib),
+            tuple((name, value.__class__, value) for name, value in var_binds),
         )
-    
-    return whole_msg
+        tail = _response_cache.get(cache_key)
+        if tail is not None:
+            _response_cache.move_to_end(cache_key)
+            whole_rsp = _assemble_response(
+                int(msg_ver), req_msg['community'].asOctets(), int(req_pdu['request-id']), tail
+            )
+        else:
+            rsp_msg = p_mod.apiMessage.get_response(req_msg)
+            rsp_pdu = p_mod.apiMessage.get_pdu(rsp_msg)
+            p_mod.apiPDU.set_varbinds(rsp_pdu, var_binds)
+            
+            # 提交错误索引到响应 PDU
+            for i in end_of_mib:
+                p_mod.apiPDU.set_end_of_mib_error(rsp_pdu, i)
+            
+            whole_rsp = encoder.encode(rsp_msg)
+            _response_cache[cache_key] = _response_tail(whole_rsp)
+            if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        
+        transport_dispatcher.send_message(whole_rsp, transport_domain, transport_address)
 
 
 # ============================================================================
@@ -623,8 +960,6 @@ def main():
     4. 启动服务并处理异常
     5. 优雅关闭和资源清理
     """
-    global mib_handlers, mib_handlers_idx
-
     logger.info("🚀 启动 SNMP-Modbus 桥接服务")
 
     # 从配置文件获取监听参数
@@ -632,8 +967,7 @@ def main():
     listen_port = SNMP_BRIDGE_CONFIG.get('listen_port', 1161)
 
     # 创建 MIB 处理器
-    mib_handlers = create_mib_handlers()
-    mib_handlers_idx = {handler.name: handler for handler in mib_handlers}
+    _build_mib_index(create_mib_handlers())
 
     # 创建传输调度器
     transport_dispatcher = AsyncioDispatcher()
@@ -666,12 +1000,7 @@ def main():
     else:
         logger.info(f"🔗 Modbus 串口: {MODBUS_RTU_CONFIG['port']} ({MODBUS_RTU_CONFIG['baudrate']})")
 
-    logger.info("🔗 支持的 OID:")
-    for handler in mib_handlers:
-        if hasattr(handler, 'description'):
-            logger.info(f"   {'.'.join(map(str, handler.name))} -> {handler.description}")
-        else:
-            logger.info(f"   {'.'.join(map(str, handler.name))} -> 系统信息")
+    logger.info(f"🔗 支持的 OID: {len(mib_handlers)} 个（明细见启动时的 OID 映射表）")
     
     try:
         # 运行调度器
@@ -682,9 +1011,7 @@ def main():
         logger.error(f"❌ 运行异常: {e}")
     finally:
         # 清理资源
-        for handler in mib_handlers:
-            if hasattr(handler, 'cleanup'):
-                handler.cleanup()
+        _close_modbus_client()
         transport_dispatcher.close_dispatcher()
         logger.info("✅ SNMP-Modbus 桥接服务已关闭")
 
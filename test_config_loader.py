@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+配置加载器测试
+
+验证快速 INI 解析器与 ConfigParser 结果一致，不支持的语法回退到 ConfigParser。
+"""
+
+import configparser
+import os
+import struct
+
+import pytest
+
+LINUX_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.linux.ini')
+
+
+def _configparser_sections(data):
+    parser = configparser.ConfigParser()
+    parser.read_string(data)
+    return {name: dict(parser.items(name)) for name in parser.sections()}
+
+
+def test_fast_parser_matches_configparser_on_linux_config(config_loader):
+    with open(LINUX_CONFIG, encoding='utf-8') as f:
+        data = f.read()
+    assert config_loader._parse_ini_fast(data) == _configparser_sections(data)
+
+
+def test_fast_parser_colon_delimiter(config_loader):
+    data = (
+        "[SNMP_OID_1]\n"
+        "oid: .1.3.6.1.4.1.1.0\n"
+        "description = a:b\n"
+        "Unit_ID : 2\n"
+        "; 注释\n"
+        "# 注释\n"
+    )
+    fast = config_loader._parse_ini_fast(data)
+    assert fast == _configparser_sections(data)
+    assert fast['SNMP_OID_1'] == {'oid': '.1.3.6.1.4.1.1.0', 'description': 'a:b', 'unit_id': '2'}
+
+
+@pytest.mark.parametrize('data', [
+    # 续行
+    "[SNMP_OID_1]\ndescription = first\n    second\n",
+    # 插值
+    "[SNMP_OID_1]\nbase = 1.3.6\noid = %(base)s.1.0\n",
+    # DEFAULT 节
+    "[DEFAULT]\nunit_id = 2\n[SNMP_OID_1]\noid = 1.3.6.1\n",
+])
+def test_fast_parser_falls_back_to_configparser(config_loader, data):
+    assert config_loader._parse_ini_fast(data) is None
+    expected = _configparser_sections(data)
+    assert config_loader._parse_ini_configparser(data, '<test>') == expected
+
+
+@pytest.mark.parametrize('data', [
+    "[SNMP_OID_1]\noid = 1.3.6.1\nOID = 1.3.6.2\n",
+    "[SNMP_OID_1]\noid = 1.3.6.1\n[SNMP_OID_1]\noid = 1.3.6.2\n",
+])
+def test_fast_parser_rejects_duplicates(config_loader, data):
+    # 重复项交给 ConfigParser，保持其报错行为
+    assert config_loader._parse_ini_fast(data) is None
+    with pytest.raises(configparser.Error):
+        config_loader._parse_ini_configparser(data, '<test>')
+
+
+def _write_config(path, listen_port, mtime_ns=None):
+    with open(LINUX_CONFIG, encoding='utf-8') as f:
+        data = f.read().replace('listen_port = 161', f'listen_port = {listen_port}')
+    path.write_text(data, encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_parse_cache_reused_until_file_changes(config_loader, tmp_path):
+    path = tmp_path / 'config.ini'
+    _write_config(path, 1161, mtime_ns=1_000_000_000)
+
+    first = config_loader.ConfigLoader(str(path))
+    assert first.get_snmp_bridge_config()['listen_port'] == 1161
+    # 文件未修改：复用同一份解析结果
+    assert config_loader.ConfigLoader(str(path)).parsed is first.parsed
+
+    # 修改文件（大小不变，只有 mtime 变化）后重新解析
+    _write_config(path, 1162, mtime_ns=2_000_000_000)
+    second = config_loader.ConfigLoader(str(path))
+    assert second.parsed is not first.parsed
+    assert second.get_snmp_bridge_config()['listen_port'] == 1162
+    # 同一文件的旧缓存已丢弃
+    assert [k for k in config_loader._PARSE_CACHE if k[0] == str(path)] == [
+        (str(path), 2_000_000_000, path.stat().st_size)
+    ]
+
+
+
+def test_frozen_config_used_until_ini_changes(config_loader, tmp_path, monkeypatch):
+    path = tmp_path / 'config.ini'
+    _write_config(path, 1161, mtime_ns=1_000_000_000)
+    generated = config_loader.ConfigLoader(str(path)).freeze()
+    assert generated == str(tmp_path / config_loader.GENERATED_MODULE)
+
+    # 清空解析缓存后，未修改的 config.ini 直接从预生成模块加载，不再解析
+    monkeypatch.setattr(config_loader, '_PARSE_CACHE', {})
+    with monkeypatch.context() as m:
+        for name in ('_parse_ini_fast', '_parse_ini_configparser'):
+            m.setattr(config_loader, name, lambda *args: pytest.fail('config.ini 不应被解析'))
+        assert config_loader.ConfigLoader(str(path)).get_snmp_bridge_config()['listen_port'] == 1161
+
+    # 修改 config.ini 后忽略过期的预生成模块，并按新内容重新生成
+    _write_config(path, 1162, mtime_ns=2_000_000_000)
+    assert config_loader.ConfigLoader(str(path)).get_snmp_bridge_config()['listen_port'] == 1162
+    key = (str(path), 2_000_000_000, path.stat().st_size)
+    sections = config_loader._load_generated(generated, key)
+    assert sections is not None and sections['SNMP_BRIDGE_CONFIG']['listen_port'] == '1162'
+
+
+
+@pytest.mark.parametrize('modbus_type, expected_gap', [('TCP', 3), ('RTU', 7), ('', 7)])
+def test_active_modbus_config(config_loader, modbus_type, expected_gap):
+    # TCP 时使用 TCP 配置，其他取值使用 RTU 配置，读取计划与桥接服务使用同一份配置
+    sections = {
+        'SNMP_BRIDGE_CONFIG': {'modbus_type': modbus_type},
+        'MODBUS_TCP_CONFIG': {'max_read_gap': '3'},
+        'MODBUS_RTU_CONFIG': {'max_read_gap': '7'},
+        'SNMP_OID_1': {'oid': '.1.3.6.1.4.1.1.1.0', 'register_address': '0', 'processing_type': 'direct'},
+        'SNMP_OID_2': {'oid': '.1.3.6.1.4.1.1.2.0', 'register_address': '8', 'processing_type': 'direct'},
+    }
+    parsed = config_loader.ParsedConfig(sections, *config_loader._bucket_sections(sections))
+    assert parsed.modbus_config['max_read_gap'] == expected_gap
+    assert parsed.modbus_config is (parsed.modbus_tcp_config if modbus_type == 'TCP'
+                                    else parsed.modbus_rtu_config)
+    assert len(parsed.modbus_read_plan) == (2 if expected_gap == 3 else 1)
+
+
+def test_snmp_oid_mapping_records(config_loader):
+    sections = [
+        ('SNMP_OID_1', {'oid': '.1.3.6.1.4.1.1.10.0', 'description': 'temp',
+                        'register_address': '0x100', 'unit_id': '2', 'function_code': '4',
+                        'data_type': 'int16', 'processing_type': 'multiply',
+                        'coefficient': '0.1', 'offset': '1', 'decimal_places': '1',
+                        'cache_ttl_ms': '0', 'snmp_data_type': 'OctetString'}),
+        ('SNMP_OID_2', {'oid': '.1.3.6.1.4.1.1.2.0', 'description': 'status',
+                        'register_address': '0x200', 'processing_type': 'communication_status',
+                        'snmp_data_type': 'Integer32'}),
+        ('SNMP_OID_3', {'oid': '.1.3.6.1.4.1.1.3.0', 'description': 'mode',
+                        'register_address': '0x300', 'processing_type': 'direct'}),
+    ]
+    records = config_loader._build_snmp_oid_mapping(sections)
+
+    # 按 OID 数值排序（.2 < .3 < .10）
+    assert [r.description for r in records] == ['status', 'mode', 'temp']
+    status, mode, temp = records
+
+    assert status.register_address is None and status.transform is None
+    assert (mode.register_address, mode.unit_id, mode.function_code, mode.data_type,
+            mode.cache_ttl_ms, mode.snmp_data_type) == (0x300, 1, 3, 'uint16', None, 'OctetString')
+    assert (temp.register_address, temp.unit_id, temp.function_code, temp.data_type,
+            temp.cache_ttl_ms) == (0x100, 2, 4, 'int16', 0)
+    assert temp.oid_tuple == (1, 3, 6, 1, 4, 1, 1, 10, 0)
+    assert temp.transform(123) == 13.3
+
+
+def test_malformed_oid_sections_are_skipped(config_loader):
+    skipped = []
+    records = config_loader._build_snmp_oid_mapping([
+        ('SNMP_OID_1', {'oid': '.1.3.6.1.4.1.1.1.0', 'processing_type': 'direct'}),
+        ('SNMP_OID_2', {'oid': '.1.3.x.9', 'processing_type': 'direct'}),
+        ('SNMP_OID_3', {'processing_type': 'direct'}),
+    ], skipped)
+    system = config_loader._build_system_oid_mapping([
+        ('SYSTEM_OID_1', {'oid': '1.3.6.1.2.1.1.1.0', 'type': 'fixed_value', 'value': 'x'}),
+        ('SYSTEM_OID_2', {'oid': '1.3.6..1', 'type': 'fixed_value', 'value': 'y'}),
+    ], skipped)
+
+    assert [r.oid for r in records] == ['.1.3.6.1.4.1.1.1.0']
+    assert [c['oid'] for c in system] == ['1.3.6.1.2.1.1.1.0']
+    assert [reason.split(']')[0] for reason in skipped] == [
+        '[SNMP_OID_2', '[SNMP_OID_3', '[SYSTEM_OID_2'
+    ]
+
+
+def _record(config_loader, index, address, data_type='uint16', function_code=3, unit_id=1):
+    return config_loader.OidRecord(
+        oid=f'.1.3.6.1.4.1.1.{index}.0', oid_tuple=(1, 3, 6, 1, 4, 1, 1, index, 0),
+        description=f'oid{index}', snmp_data_type='OctetString', processing_type='direct',
+        transform=None, register_address=address, unit_id=unit_id,
+        function_code=function_code, data_type=data_type,
+    )
+
+
+def _plan(config_loader, specs, max_gap=0):
+    """specs: [(地址, 数据类型[, 功能码[, 单元 ID]])]，返回 [(单元, 功能码, 起始地址, 数量, [成员偏移])]"""
+    records = [_record(config_loader, i, *spec) for i, spec in enumerate(specs, 1)]
+    plan = config_loader._build_modbus_read_plan(records, max_gap)
+    return [(g['unit_id'], g['function_code'], g['start'], g['count'],
+             [offset for _, offset, _ in g['members']]) for g in plan]
+
+
+@pytest.mark.parametrize('specs, max_gap, expected', [
+    # 连续地址合并，间隔 1 个寄存器时默认不合并
+    ([(0x10, 'uint16'), (0x11, 'int32'), (0x14, 'uint16')], 0,
+     [(1, 3, 0x10, 3, [0, 1]), (1, 3, 0x14, 1, [0])]),
+    # 间隔不超过 max_gap 时合并，空隙计入读取数量
+    ([(0x10, 'uint16'), (0x11, 'int32'), (0x14, 'uint16')], 1,
+     [(1, 3, 0x10, 5, [0, 1, 4])]),
+    ([(0x10, 'uint16'), (0x14, 'uint16')], 2,
+     [(1, 3, 0x10, 1, [0]), (1, 3, 0x14, 1, [0])]),
+    # 配置顺序不影响分组，按地址排序
+    ([(0x12, 'uint16'), (0x10, 'uint16'), (0x11, 'uint16')], 0,
+     [(1, 3, 0x10, 3, [0, 1, 2])]),
+    # 不同单元 / 功能码不合并
+    ([(0x10, 'uint16', 3, 1), (0x11, 'uint16', 3, 2), (0x12, 'uint16', 4, 1)], 10,
+     [(1, 3, 0x10, 1, [0]), (1, 4, 0x12, 1, [0]), (2, 3, 0x11, 1, [0])]),
+    # 寄存器分组不超过 125 个
+    ([(0, 'uint16'), (123, 'uint16'), (124, 'uint16'), (125, 'uint16')], 200,
+     [(1, 3, 0, 125, [0, 123, 124]), (1, 3, 125, 1, [0])]),
+    ([(0, 'uint16'), (123, 'int32')], 200,
+     [(1, 3, 0, 125, [0, 123])]),
+    ([(0, 'uint16'), (124, 'int32')], 200,
+     [(1, 3, 0, 1, [0]), (1, 3, 124, 2, [0])]),
+    # 线圈 / 离散输入每个 OID 占 1 位，不超过 2000 位
+    ([(0, 'int64', 1), (1, 'int64', 1), (1999, 'uint16', 1), (2000, 'uint16', 1)], 2000,
+     [(1, 1, 0, 2000, [0, 1, 1999]), (1, 1, 2000, 1, [0])]),
+    ([(5, 'uint16', 2), (7, 'uint16', 2)], 0,
+     [(1, 2, 5, 1, [0]), (1, 2, 7, 1, [0])]),
+])
+def test_read_plan_groups(config_loader, specs, max_gap, expected):
+    assert _plan(config_loader, specs, max_gap) == expected
+
+
+def test_read_plan_skips_records_without_register(config_loader):
+    records = [_record(config_loader, 1, None), _record(config_loader, 2, 0x10)]
+    plan = config_loader._build_modbus_read_plan(records)
+    assert [m[0] for g in plan for m in g['members']] == [records[1].oid_tuple]
+
+
+def _registers_payload(values):
+    """[(数据类型, 值)] 按大端序依次打包（高位字在前）"""
+    return b''.join(struct.pack('>' + {'uint16': 'H', 'int16': 'h', 'uint32': 'I', 'int32': 'i',
+                                       'float32': 'f', 'uint64': 'Q', 'int64': 'q',
+                                       'float64': 'd'}[t], v) for t, v in values)
+
+
+@pytest.mark.parametrize('values', [
+    [('uint16', 0xFFFF), ('int16', -2), ('uint32', 0x12345678), ('int32', -123456)],
+    [('float32', 1.5), ('float64', -2.25), ('uint64', 0x0102030405060708), ('int64', -(2 ** 62))],
+    [('int64', -1), ('uint32', 0xDEADBEEF), ('float32', -0.0), ('int16', -32768)],
+])
+def test_group_decoder_matches_struct_unpack(config_loader, values):
+    records, address = [], 0x40
+    for i, (data_type, _) in enumerate(values, 1):
+        records.append(_record(config_loader, i, address, data_type))
+        address += config_loader.REGISTER_COUNTS[data_type]
+    [group] = config_loader._build_modbus_read_plan(records)
+    payload = _registers_payload(values)
+    assert group['count'] * 2 == len(payload)
+
+    expected = [struct.unpack_from('>' + config_loader.STRUCT_CODES[t], payload, offset)[0]
+                for (t, _), offset in zip(values, (m[1] * 2 for m in group['members']))]
+    assert list(group['decode'](payload)) == expected == [v for _, v in values]
+
+
+def test_group_decoder_word_order(config_loader):
+    # 32/64 位数值高位字在前：寄存器 0x1234, 0x5678 -> 0x12345678
+    records = [_record(config_loader, 1, 0, 'uint32'), _record(config_loader, 2, 2, 'uint64'),
+               _record(config_loader, 3, 6, 'float32')]
+    [group] = config_loader._build_modbus_read_plan(records)
+    registers = [0x1234, 0x5678, 0x0001, 0x0002, 0x0003, 0x0004, 0x3FC0, 0x0000]
+    payload = struct.pack('>8H', *registers)
+    assert list(group['decode'](payload)) == [0x12345678, 0x0001000200030004, 1.5]
+
+
+def test_group_decoder_skips_gaps(config_loader):
+    records = [_record(config_loader, 1, 0x10, 'int16'), _record(config_loader, 2, 0x13, 'int32')]
+    [group] = config_loader._build_modbus_read_plan(records, max_gap=2)
+    payload = struct.pack('>H2Hi', 0xFFFE, 0xAAAA, 0xBBBB, -7)
+    assert list(group['decode'](payload)) == [-2, -7]
+
+
+def test_group_decoder_unknown_type_falls_back_to_uint16(config_loader):
+    records = [_record(config_loader, 1, 0, 'bcd16'), _record(config_loader, 2, 1, 'int16')]
+    [group] = config_loader._build_modbus_read_plan(records)
+    assert group['count'] == 2
+    assert list(group['decode'](struct.pack('>Hh', 0x9999, -1))) == [0x9999, -1]
+
+
+
+def test_group_decoder_overlapping_members(config_loader):
+    # 同一地址既按 uint32 又按两个 16 位值读取：成员重叠时逐个解码
+    records = [_record(config_loader, 1, 0x10, 'uint32'), _record(config_loader, 2, 0x10, 'int16'),
+               _record(config_loader, 3, 0x11, 'uint16'), _record(config_loader, 4, 0x11, 'float32')]
+    [group] = config_loader._build_modbus_read_plan(records)
+    assert (group['start'], group['count']) == (0x10, 3)
+    assert [(m[1], m[2]) for m in group['members']] == [
+        (0, 'uint32'), (0, 'int16'), (1, 'uint16'), (1, 'float32')
+    ]
+
+    payload = struct.pack('>Hf', 0xFFFE, 1.5)
+    expected = [struct.unpack_from('>I', payload, 0)[0], -2,
+                struct.unpack_from('>H', payload, 2)[0], 1.5]
+    assert list(group['decode'](payload)) == expected
+
+
+def test_group_decoder_64bit_after_16bit(config_loader):
+    records = [_record(config_loader, 1, 0x20, 'int16'), _record(config_loader, 2, 0x21, 'float64'),
+               _record(config_loader, 3, 0x25, 'uint16'), _record(config_loader, 4, 0x26, 'int64')]
+    [group] = config_loader._build_modbus_read_plan(records)
+    assert [m[1] for m in group['members']] == [0, 1, 5, 6]
+    assert group['count'] == 10
+
+    payload = struct.pack('>hdHq', -3, -0.125, 0xABCD, -(2 ** 40))
+    assert list(group['decode'](payload)) == [-3, -0.125, 0xABCD, -(2 ** 40)]
+    # 重叠成员的逐个解码路径得到同样的偏移
+    overlap = config_loader._build_group_decoder(3, group['members'] + [group['members'][0]])
+    assert list(overlap(payload)) == [-3, -0.125, 0xABCD, -(2 ** 40), -3]
+
+
+@pytest.mark.parametrize('function_code', [1, 2])
+def test_group_decoder_bits(config_loader, function_code):
+    records = [_record(config_loader, 1, 3, 'uint16', function_code),
+               _record(config_loader, 2, 0, 'uint16', function_code),
+               _record(config_loader, 3, 9, 'uint16', function_code)]
+    [group] = config_loader._build_modbus_read_plan(records, max_gap=8)
+    assert (group['start'], group['count']) == (0, 10)
+    # pymodbus 返回的位列表按 8 位补齐
+    bits = [True, False, False, True, False, False, False, False,
+            False, True, False, False, False, False, False, False]
+    # 成员按地址排序：0, 3, 9
+    assert group['decode'](bits) == [True, True, True]
+    assert group['decode']([False] * 16) == [False, False, False]
+
+
+def test_split_read_group(config_loader):
+    records = [_record(config_loader, 1, 0x10, 'int16'), _record(config_loader, 2, 0x11, 'float32'),
+               _record(config_loader, 3, 0x15, 'uint64')]
+    [group] = config_loader._build_modbus_read_plan(records, max_gap=2)
+    parts = config_loader.split_read_group(group)
+
+    assert [(p['unit_id'], p['function_code'], p['start'], p['count']) for p in parts] == [
+        (1, 3, 0x10, 1), (1, 3, 0x11, 2), (1, 3, 0x15, 4)
+    ]
+    assert [p['members'] for p in parts] == [[(m[0], 0, m[2])] for m in group['members']]
+    assert list(parts[0]['decode'](struct.pack('>h', -5))) == [-5]
+    assert list(parts[1]['decode'](struct.pack('>f', 2.5))) == [2.5]
+    assert list(parts[2]['decode'](struct.pack('>Q', 2 ** 40))) == [2 ** 40]
+
+
+def test_split_read_group_bits(config_loader):
+    records = [_record(config_loader, 1, 4, 'uint16', 1), _record(config_loader, 2, 6, 'uint16', 1)]
+    [group] = config_loader._build_modbus_read_plan(records, max_gap=1)
+    parts = config_loader.split_read_group(group)
+    assert [(p['start'], p['count']) for p in parts] == [(4, 1), (6, 1)]
+    assert parts[1]['decode']([True] + [False] * 7) == [True]
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+桥接服务测试
+
+验证响应缓存拼接出的报文与 pyasn1 完整编码的结果逐字节一致，
+以及分组读取的缓存、并发合并和拆分读取（使用假的 Modbus 客户端）。
+"""
+
+import asyncio
+import bisect
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('pysnmp')
+pytest.importorskip('pymodbus')
+
+from pyasn1.codec.ber import encoder  # noqa: E402
+from pysnmp.proto import api  # noqa: E402
+from pymodbus.pdu import ExceptionResponse  # noqa: E402
+
+
+def _encode_response(msg_ver, community, request_id, var_binds):
+    p_mod = api.PROTOCOL_MODULES[msg_ver]
+    msg = p_mod.Message()
+    p_mod.apiMessage.set_defaults(msg)
+    p_mod.apiMessage.set_community(msg, community)
+    pdu = p_mod.GetResponsePDU()
+    p_mod.apiPDU.set_defaults(pdu)
+    p_mod.apiPDU.set_request_id(pdu, request_id)
+    p_mod.apiPDU.set_varbinds(pdu, var_binds)
+    p_mod.apiMessage.set_pdu(msg, pdu)
+    return encoder.encode(msg)
+
+
+@pytest.mark.parametrize('msg_ver', [api.SNMP_VERSION_1, api.SNMP_VERSION_2C])
+@pytest.mark.parametrize('request_id', [0, 1, 127, 128, -128, -129, 2 ** 31 - 1, -2 ** 31])
+@pytest.mark.parametrize('community', [b'public', b'x' * 200])
+@pytest.mark.parametrize('count', [1, 30])
+def test_assembled_response_matches_encoder(bridge, msg_ver, request_id, community, count):
+    p_mod = api.PROTOCOL_MODULES[msg_ver]
+    var_binds = [((1, 3, 6, 1, 4, 1, 41475, i, 0), p_mod.OctetString('%.2f' % (i * 1.5)))
+                 for i in range(count)]
+    whole_rsp = _encode_response(msg_ver, community, request_id, var_binds)
+
+    tail = bridge._response_tail(whole_rsp)
+    assert bridge._assemble_response(int(msg_ver), community, request_id, tail) == whole_rsp
+
+
+def test_cached_tail_reused_with_new_request_id(bridge):
+    # 同一变量绑定换一个 request-id 和团体名，拼接结果与重新编码一致
+    var_binds = [((1, 3, 6, 1, 2, 1, 1, 1, 0), api.PROTOCOL_MODULES[1].OctetString('bridge'))]
+    tail = bridge._response_tail(_encode_response(1, b'public', 1, var_binds))
+    expected = _encode_response(1, b'private', 300000, var_binds)
+    assert bridge._assemble_response(1, b'private', 300000, tail) == expected
+
+
+class FakeModbus:
+    """假的 Modbus 设备：按地址返回寄存器值，记录每次读取请求"""
+
+    def __init__(self):
+        self.connected = True
+        self.registers = {}
+        self.exception_code = None    # 设置后所有读取都返回该异常码
+        self.rejected_reads = set()   # 返回非法数据地址的 (起始地址, 数量)
+        self.requests = []
+
+    async def read_holding_registers(self, address, count, device_id):
+        self.requests.append((address, count))
+        await asyncio.sleep(0)
+        if self.exception_code is not None:
+            return ExceptionResponse(3, self.exception_code)
+        if (address, count) in self.rejected_reads:
+            return ExceptionResponse(3, 2)
+        return SimpleNamespace(isError=lambda: False,
+                               registers=[self.registers.get(address + i, 0) for i in range(count)])
+
+
+@pytest.fixture
+def fake_modbus(bridge, config_loader, monkeypatch):
+    """替换共享客户端、读取计划、读取缓存和单调时钟，返回 (设备, 设置读取计划的函数, 时钟)"""
+    device = FakeModbus()
+    clock = SimpleNamespace(now=10 ** 12)
+    monkeypatch.setattr(bridge, '_modbus_client', device)
+    monkeypatch.setattr(bridge, '_read_fns', {3: device.read_holding_registers})
+    monkeypatch.setattr(bridge, '_group_cache', {})
+    monkeypatch.setattr(bridge, '_inflight_reads', {})
+    monkeypatch.setattr(bridge, '_split_groups', {})
+    monkeypatch.setattr(bridge.time, 'monotonic_ns', lambda: clock.now)
+
+    def set_plan(records, max_gap=0):
+        plan = config_loader._build_modbus_read_plan(records, max_gap)
+        monkeypatch.setattr(bridge, 'MODBUS_READ_PLAN', plan)
+        monkeypatch.setattr(bridge, '_READ_SLOTS', {
+            oid_tuple: (group_index, member_index)
+            for group_index, group in enumerate(plan)
+            for member_index, (oid_tuple, _, _) in enumerate(group['members'])
+        })
+        return plan
+
+    return device, set_plan, clock
+
+
+def _record(config_loader, index, address, data_type='uint16', cache_ttl_ms=None):
+    return config_loader.OidRecord(
+        oid=f'.1.3.6.1.4.1.1.{index}.0', oid_tuple=(1, 3, 6, 1, 4, 1, 1, index, 0),
+        description=f'oid{index}', snmp_data_type='OctetString', processing_type='direct',
+        transform=None, register_address=address, unit_id=1, function_code=3,
+        data_type=data_type, cache_ttl_ms=cache_ttl_ms,
+    )
+
+
+def test_rejected_group_split_and_retried(bridge, config_loader, fake_modbus):
+    device, set_plan, clock = fake_modbus
+    set_plan([_record(config_loader, 1, 0x10), _record(config_loader, 2, 0x12, 'int32')], max_gap=1)
+    device.registers = {0x10: 7, 0x12: 0xFFFF, 0x13: 0xFFFE}
+    device.rejected_reads = {(0x10, 4)}
+
+    # 非法数据地址：拆成逐个成员读取
+    assert asyncio.run(bridge._read_modbus_group(0)) == [7, -2]
+    assert device.requests == [(0x10, 4), (0x10, 1), (0x12, 2)]
+
+    # retry_interval 内继续逐个读取
+    device.requests.clear()
+    retry_ns = bridge._MODBUS_CONFIG['retry_interval'] * 1_000_000_000
+    clock.now += retry_ns - 1
+    assert asyncio.run(bridge._read_modbus_group(0)) == [7, -2]
+    assert device.requests == [(0x10, 1), (0x12, 2)]
+
+    # 到期后重试整组读取，仍被拒绝则再等一个 retry_interval
+    device.requests.clear()
+    clock.now += 1
+    assert asyncio.run(bridge._read_modbus_group(0)) == [7, -2]
+    assert device.requests == [(0x10, 4), (0x10, 1), (0x12, 2)]
+    assert bridge._split_groups[0][0] == clock.now + retry_ns
+
+    # 设备恢复后回到整组读取
+    device.requests.clear()
+    device.rejected_reads.clear()
+    clock.now += retry_ns
+    assert list(asyncio.run(bridge._read_modbus_group(0))) == [7, -2]
+    assert device.requests == [(0x10, 4)]
+    assert bridge._split_groups == {}
+
+
+@pytest.mark.parametrize('exception_code', [4, 6, 0x0A, 0x0B])
+def test_transient_exception_does_not_split(bridge, config_loader, fake_modbus, exception_code):
+    device, set_plan, _ = fake_modbus
+    set_plan([_record(config_loader, 1, 0x10), _record(config_loader, 2, 0x11)])
+    device.exception_code = exception_code
+
+    assert asyncio.run(bridge._read_modbus_group(0)) is None
+    assert device.requests == [(0x10, 2)]
+    assert bridge._split_groups == {}
+
+
+def test_illegal_data_value_splits(bridge, config_loader, fake_modbus):
+    device, set_plan, _ = fake_modbus
+    set_plan([_record(config_loader, 1, 0x10), _record(config_loader, 2, 0x11)])
+    device.exception_code = 3
+
+    # 拆分后的单个读取也被拒绝：各成员均无值
+    assert asyncio.run(bridge._read_modbus_group(0)) is None
+    assert device.requests == [(0x10, 2), (0x10, 1), (0x11, 1)]
+    assert 0 in bridge._split_groups
+
+
+def test_group_read_cached_within_ttl(bridge, config_loader, fake_modbus):
+    device, set_plan, clock = fake_modbus
+    records = [_record(config_loader, 1, 0x10), _record(config_loader, 2, 0x11)]
+    set_plan(records)
+    device.registers = {0x10: 1, 0x11: 2}
+    handlers = [bridge.ModbusOIDHandler(record) for record in records]
+    ttl_ns = bridge._READ_TTL_NS
+    assert handlers[0].cache_ttl_ns == ttl_ns > 0
+
+    # TTL 内的两次 GET 只读取一次设备
+    asyncio.run(bridge._refresh_stale_groups(handlers[:1]))
+    clock.now += ttl_ns - 1
+    asyncio.run(bridge._refresh_stale_groups(handlers))
+    assert device.requests == [(0x10, 2)]
+    assert [h._read_modbus_value() for h in handlers] == [1, 2]
+
+    # 过期后重新读取
+    device.registers = {0x10: 3, 0x11: 4}
+    clock.now += 1
+    asyncio.run(bridge._refresh_stale_groups(handlers))
+    assert device.requests == [(0x10, 2), (0x10, 2)]
+    assert [h._read_modbus_value() for h in handlers] == [3, 4]
+
+
+def test_concurrent_pdus_share_one_read(bridge, config_loader, fake_modbus):
+    device, set_plan, _ = fake_modbus
+    records = [_record(config_loader, 1, 0x10), _record(config_loader, 2, 0x20)]
+    set_plan(records)
+    handlers = [bridge.ModbusOIDHandler(record) for record in records]
+
+    async def concurrent_gets():
+        await asyncio.gather(*(bridge._refresh_stale_groups(handlers) for _ in range(3)))
+        assert bridge._inflight_reads == {}
+
+    asyncio.run(concurrent_gets())
+    assert sorted(device.requests) == [(0x10, 1), (0x20, 1)]
+    assert set(bridge._group_cache) == {0, 1}
+
+
+def test_failed_read_not_cached(bridge, config_loader, fake_modbus):
+    device, set_plan, _ = fake_modbus
+    records = [_record(config_loader, 1, 0x10)]
+    set_plan(records)
+    handler = bridge.ModbusOIDHandler(records[0])
+
+    device.exception_code = 6
+    asyncio.run(bridge._refresh_stale_groups([handler]))
+    assert handler._read_modbus_value() is None
+
+    # 读取失败的结果不复用，下一次 GET 立即重新读取
+    device.exception_code = None
+    device.registers = {0x10: 9}
+    asyncio.run(bridge._refresh_stale_groups([handler]))
+    assert device.requests == [(0x10, 1), (0x10, 1)]
+    assert handler._read_modbus_value() == 9
+
+
+def test_cache_ttl_ms_overrides_update_interval(bridge, config_loader, fake_modbus):
+    device, set_plan, clock = fake_modbus
+    # 同一分组内：计数器每次都读（0），状态使用默认 TTL，温度 2 秒
+    records = [_record(config_loader, 1, 0x10, cache_ttl_ms=0),
+               _record(config_loader, 2, 0x11),
+               _record(config_loader, 3, 0x12, cache_ttl_ms=2000)]
+    [group] = set_plan(records)
+    assert len(group['members']) == 3
+    counter, status, temp = (bridge.ModbusOIDHandler(record) for record in records)
+    assert (counter.cache_ttl_ns, status.cache_ttl_ns, temp.cache_ttl_ns) == (
+        0, bridge._READ_TTL_NS, 2_000_000_000)
+
+    asyncio.run(bridge._refresh_stale_groups([status, temp]))
+    assert len(device.requests) == 1
+
+    # 只请求长 TTL 的 OID 时复用缓存
+    clock.now += 1_000_000_000
+    asyncio.run(bridge._refresh_stale_groups([status, temp]))
+    assert len(device.requests) == 1
+
+    # 请求 TTL 为 0 的 OID 时刷新整个分组
+    asyncio.run(bridge._refresh_stale_groups([counter]))
+    asyncio.run(bridge._refresh_stale_groups([counter, status]))
+    assert len(device.requests) == 3
+
+    # 温度的 2 秒 TTL 从最近一次分组读取算起
+    clock.now += 1_999_999_999
+    asyncio.run(bridge._refresh_stale_groups([temp]))
+    assert len(device.requests) == 3
+    clock.now += 1
+    asyncio.run(bridge._refresh_stale_groups([temp]))
+    assert len(device.requests) == 4
+
+
+@pytest.fixture
+def mib(bridge, monkeypatch):
+    """按测试配置建立 MIB 查找表，测试结束后恢复"""
+    for name in ('mib_handlers', 'mib_handler_keys', 'mib_handlers_idx', 'mib_handlers_next'):
+        monkeypatch.setattr(bridge, name, None, raising=False)
+    bridge._build_mib_index(bridge.create_mib_handlers())
+    return bridge.mib_handlers
+
+
+def test_getnext_successor_table_matches_bisect(bridge, mib):
+    keys = bridge.mib_handler_keys
+    assert len(keys) > 1 and keys == sorted(set(keys))
+    assert set(bridge.mib_handlers_next) == set(keys)
+    for key in keys:
+        assert bridge.mib_handlers_next[key] == bisect.bisect(keys, key)
+
+
+def _getnext(bridge, *oids):
+    p_mod = api.PROTOCOL_MODULES[api.SNMP_VERSION_2C]
+    varbinds = [(p_mod.ObjectIdentifier(oid), p_mod.Null('')) for oid in oids]
+    targets, end_of_mib = bridge._resolve_getnext(varbinds)
+    return [(tuple(oid), handler) for oid, handler, _ in targets], end_of_mib
+
+
+def test_getnext_walk(bridge, mib):
+    # 用每个响应 OID 继续请求，依次走完整个 MIB
+    walked, oid = [], (1, 3)
+    while True:
+        [(oid, handler)], end_of_mib = _getnext(bridge, oid)
+        if end_of_mib:
+            break
+        assert handler.name == oid
+        walked.append(oid)
+    assert walked == bridge.mib_handler_keys
+
+
+def test_getnext_oids_not_in_table(bridge, mib):
+    keys = bridge.mib_handler_keys
+    first, second, last = keys[0], keys[1], keys[-1]
+    targets, end_of_mib = _getnext(
+        bridge,
+        (1, 3, 6),           # 所有 OID 之前
+        first + (0,),        # 两个已注册 OID 之间
+        first[:-1],          # 已注册 OID 的前缀
+        last,                # 最后一个 OID
+        last + (1,),         # 超出 MIB 末尾
+    )
+    assert [handler.name if handler else None for _, handler in targets] == [
+        first, second, first, None, None
+    ]
+    # 超出末尾的变量绑定原样返回 OID，并记录其序号（从 1 开始）
+    assert end_of_mib == [4, 5]
+    assert [oid for oid, _ in targets[3:]] == [last, last + (1,)]